@@ -0,0 +1,179 @@
+"""Offline benchmarks for the CLI and the pieces of ExecuteAnyOperator that run on every task.
+
+Run them with ``python -m execute_any_operator.benchmarks``. Every metric is a duration in
+seconds, so lower is better, and results can be compared against a previous run's JSON.
+"""
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from execute_any_operator.operators import ensure_airflow_patched
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+def benchmark(func: Callable[[], Dict[str, float]]) -> Callable[[], Dict[str, float]]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _best_per_call(func: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Best mean time per call over ``repeat`` rounds of ``number`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def _cold_import(module: str, repeat: int = 5) -> float:
+    """Median time to import ``module`` in a fresh interpreter."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = [
+        float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+        for _ in range(repeat)
+    ]
+    return statistics.median(samples)
+
+
+@benchmark
+def cli_import() -> Dict[str, float]:
+    return {
+        "entrypoint_cold_import": _cold_import("execute_any_operator.entrypoint"),
+        "execute_any_cold_import": _cold_import("execute_any_operator.operators.execute_any"),
+    }
+
+
+@benchmark
+def operator_overhead() -> Dict[str, float]:
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+    operator = "execute_any_operator.benchmarks.noop:NoopOperator"
+    task = ExecuteAnyOperator(operator=operator, task_id="noop", do_xcom_push=False)
+    return {
+        "construct": _best_per_call(lambda: ExecuteAnyOperator(operator=operator, task_id="noop"), number=50),
+        "execute": _best_per_call(task.execute, number=500),
+        "generate_context": _best_per_call(task._generate_context, number=200),
+    }
+
+
+@benchmark
+def context_generation() -> Dict[str, float]:
+    """Building the lazy context versus building it and reading every entry, as an eager context did."""
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+    task = ExecuteAnyOperator(operator="execute_any_operator.benchmarks.noop:NoopOperator", task_id="noop")
+    return {
+        "lazy": _best_per_call(task._generate_context, number=200),
+        "all_entries": _best_per_call(lambda: dict(task._generate_context()), number=200),
+    }
+
+
+@benchmark
+def log_call() -> Dict[str, float]:
+    """A log call writing to a file from the calling thread versus putting the record on the queue."""
+    import logging
+    import os
+    import tempfile
+
+    from execute_any_operator.utils.logs import LogPipeline
+
+    logger = logging.getLogger("execute_any_operator.benchmarks.log_call")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_handler = logging.FileHandler(os.path.join(tmp, "bench.log"))
+        logger.addHandler(file_handler)
+        synchronous = _best_per_call(lambda: logger.info("benchmark %d", 1), number=2000)
+        logger.removeHandler(file_handler)
+
+        pipeline = LogPipeline([file_handler])
+        pipeline.listener.start()
+        logger.addHandler(pipeline.handler)
+        queued = _best_per_call(lambda: logger.info("benchmark %d", 1), number=2000)
+        logger.removeHandler(pipeline.handler)
+        pipeline.stop()
+        file_handler.close()
+    return {"synchronous": synchronous, "queued": queued}
+
+
+@benchmark
+def xcom_throughput(entries: int = 10_000) -> Dict[str, float]:
+    from execute_any_operator.utils.dict_xcom_backend import DictXComBackend, isolated_xcom
+
+    task_ids = [f"task_{i}" for i in range(entries)]
+    xcoms = [("return_value", {"i": i}, task_id, "bench") for i, task_id in enumerate(task_ids)]
+    with isolated_xcom():
+        set_one = _best_per_call(lambda: DictXComBackend.set("return_value", 1, "task_0", "bench"), number=1000)
+        set_many = _best_per_call(lambda: DictXComBackend.set_many(xcoms), number=1, repeat=3)
+        DictXComBackend.set_many(xcoms)
+        get_many = _best_per_call(lambda: DictXComBackend.get_many("return_value", task_ids, "bench"), number=1, repeat=3)
+        get_one = _best_per_call(lambda: DictXComBackend.get_one("return_value", "task_1", "bench"), number=1000)
+    return {
+        "set_one": set_one,
+        f"set_many_{entries}": set_many,
+        f"get_many_{entries}": get_many,
+        "get_one": get_one,
+    }
+
+
+@benchmark
+def connection_lookup(env_sizes: Iterable[int] = (100, 1_000, 10_000)) -> Dict[str, float]:
+    ensure_airflow_patched()
+    from airflow.models import Connection
+    from execute_any_operator.utils.alchemy_mock import mockSession
+    from execute_any_operator.utils.isolation import environ_changed
+
+    session = mockSession()
+    results = {}
+    added: List[str] = []
+    os.environ["AIRFLOW_CONN_BENCH_DEFAULT"] = "http://example.com"
+    try:
+        for size in env_sizes:
+            for i in range(len(added), size):
+                added.append(f"BENCH_FILLER_{i}")
+                os.environ[added[-1]] = "x"
+            environ_changed()
+            results[f"exact_env_{size}"] = _best_per_call(
+                lambda: session.query(Connection).filter(Connection.conn_id == "bench_default").first(), number=200
+            )
+            results[f"like_env_{size}"] = _best_per_call(
+                lambda: session.query(Connection).filter(Connection.conn_id.like("bench%")).all(), number=200
+            )
+    finally:
+        for key in added + ["AIRFLOW_CONN_BENCH_DEFAULT"]:
+            os.environ.pop(key, None)
+        environ_changed()
+    return results
+
+
+def run(names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    from execute_any_operator import __version__
+
+    names = list(names or BENCHMARKS)
+    unknown = set(names) - BENCHMARKS.keys()
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "results": {name: BENCHMARKS[name]() for name in names},
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_ratio: float) -> List[str]:
+    """Describe every metric that got slower than ``max_ratio`` times its baseline."""
+    regressions = []
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            previous = baseline.get("results", {}).get(name, {}).get(metric)
+            if previous and value / previous > max_ratio:
+                regressions.append(f"{name}.{metric}: {previous:.6g}s -> {value:.6g}s ({value / previous:.2f}x)")
+    return regressions
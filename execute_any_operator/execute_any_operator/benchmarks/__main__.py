@@ -0,0 +1,46 @@
+import json
+
+import click
+from execute_any_operator.benchmarks import BENCHMARKS, compare, run
+
+
+@click.command()
+@click.option(
+    "-b",
+    "--benchmark",
+    "names",
+    multiple=True,
+    type=click.Choice(sorted(BENCHMARKS)),
+    help="Benchmark to run, can be given multiple times. Runs all benchmarks by default.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to write the JSON results to. Defaults to stdout.",
+)
+@click.option(
+    "--baseline",
+    default=None,
+    type=click.File("r"),
+    help="JSON results of a previous run to compare against.",
+)
+@click.option(
+    "--max-regression",
+    default=1.25,
+    show_default=True,
+    help="Fail when a metric is slower than its baseline by more than this factor.",
+)
+def main(names, output, baseline, max_regression):
+    """Run the execute-any-operator benchmarks and write the results as JSON."""
+    results = run(names)
+    output.write(json.dumps(results, indent=2) + "\n")
+    if baseline is not None:
+        regressions = compare(results, json.load(baseline), max_regression)
+        if regressions:
+            raise click.ClickException("Performance regressions:\n" + "\n".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from airflow.models.baseoperator import BaseOperator
+
+
+class NoopOperator(BaseOperator):
+    """Does nothing, so benchmarks measure only the ExecuteAnyOperator overhead."""
+
+    def execute(self, context):
+        return None
@@ -1,21 +1,72 @@
+import importlib
 import os
+from typing import Dict, Optional
 
 import click
-from execute_any_operator.entrypoint.arrow_hdfs_sensor import arrow_hdfs_sensor
-from execute_any_operator.entrypoint.bash_operator import bash_operator
-from execute_any_operator.entrypoint.hive_operator import hive_operator
-from execute_any_operator.entrypoint.kubernetes_pod_operator import \
-    kubernetes_pod_operator
-from execute_any_operator.entrypoint.python_operator import python_operator
-from execute_any_operator.entrypoint.remote_bash_operator import \
-    remote_bash_operator
-from execute_any_operator.entrypoint.s3_key_sensor import s3_key_sensor
-from execute_any_operator.entrypoint.simple_http_operator import \
-    simple_http_operator
+from execute_any_operator.operators import ensure_airflow_patched
 from execute_any_operator.utils.helpers import _multi_tuple_to_dict
+from execute_any_operator.utils.isolation import environ_changed, set_cli_env
+from execute_any_operator.utils.logs import LOG_DIR_ENV, LOG_FORMAT_ENV
+from execute_any_operator.utils.metrics import metrics
+from execute_any_operator.utils.result_cache import (
+    CACHE_DIR_ENV,
+    CACHE_MAX_BYTES_ENV,
+    CACHE_TTL_ENV,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_TTL,
+)
+from execute_any_operator.utils.templating import set_rendering_enabled
+from execute_any_operator.utils.variables import VARIABLES_FILE_ENV
+
+
+class LazyGroup(click.Group):
+    """A click group that only imports a subcommand's module when it is requested.
+
+    Subcommands are registered as ``name -> "module.path:command"`` so that running
+    one operator (or just ``--help``) never pays for importing every other operator.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
 
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
 
-@click.group()
+    def _lazy_load(self, cmd_name):
+        import_path = self.lazy_subcommands[cmd_name]
+        mod_name, cmd_object_name = import_path.split(":", 1)
+        cmd_object = getattr(importlib.import_module(mod_name), cmd_object_name)
+        if not isinstance(cmd_object, click.Command):
+            raise ValueError(f"Lazy loading of {import_path} failed by returning a non-command object")
+        return cmd_object
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "arrow-hdfs-sensor": "execute_any_operator.entrypoint.arrow_hdfs_sensor:arrow_hdfs_sensor",
+        "bash-operator": "execute_any_operator.entrypoint.bash_operator:bash_operator",
+        "hive-operator": "execute_any_operator.entrypoint.hive_operator:hive_operator",
+        "http-fan-out": "execute_any_operator.entrypoint.http_fan_out:http_fan_out",
+        "kubernetes-pod-operator": "execute_any_operator.entrypoint.kubernetes_pod_operator:kubernetes_pod_operator",
+        "python-operator": "execute_any_operator.entrypoint.python_operator:python_operator",
+        "remote-bash-operator": "execute_any_operator.entrypoint.remote_bash_operator:remote_bash_operator",
+        "run-batch": "execute_any_operator.entrypoint.run_batch:run_batch",
+        "run-dag": "execute_any_operator.entrypoint.run_dag:run_dag",
+        "s3-bulk-check": "execute_any_operator.entrypoint.s3_bulk_check:s3_bulk_check",
+        "s3-key-sensor": "execute_any_operator.entrypoint.s3_key_sensor:s3_key_sensor",
+        "serve": "execute_any_operator.entrypoint.serve:serve",
+        "simple-http-operator": "execute_any_operator.entrypoint.simple_http_operator:simple_http_operator",
+        "submit": "execute_any_operator.entrypoint.serve:submit",
+        "watch": "execute_any_operator.entrypoint.watch:watch",
+    },
+)
 @click.version_option()
 @click.option(
     "--env-var",
@@ -25,19 +76,128 @@ from execute_any_operator.utils.helpers import _multi_tuple_to_dict
     callback=_multi_tuple_to_dict,
     help="Environment variables for operators to use, can also accessed via Variable.get."
 )
-def cli(env_var):
+@click.option(
+    "--variables-file",
+    default=None,
+    envvar=VARIABLES_FILE_ENV,
+    type=click.Path(dir_okay=False),
+    help="JSON or YAML file of Airflow variables for Variable.get, re-read whenever it changes.",
+)
+@click.option(
+    "--metrics-json",
+    default=None,
+    envvar="EXECUTE_ANY_OPERATOR_METRICS_JSON",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a JSON summary of phase timings, peak RSS and CPU time to this file on exit.",
+)
+@click.option(
+    "--metrics-textfile",
+    default=None,
+    envvar="EXECUTE_ANY_OPERATOR_METRICS_TEXTFILE",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the metrics as an OpenMetrics textfile (e.g. for the node exporter) on exit.",
+)
+@click.option(
+    "--profile",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Dump a cProfile stats file of each operator's execute call. '{task_id}' in the path is replaced.",
+)
+@click.option(
+    "--preload",
+    default=None,
+    multiple=True,
+    envvar="EXECUTE_ANY_OPERATOR_PRELOAD",
+    help="Operator to import and cache before running, in module notation (my.module:OperatorClass).",
+)
+@click.option(
+    "--render-templates/--no-render-templates",
+    default=False,
+    envvar="EXECUTE_ANY_OPERATOR_RENDER_TEMPLATES",
+    help="""Render Jinja templates such as '{{ ds }}' in the operator's template fields before executing it.
+Off by default, so fields such as a 'bash_command' are passed through literally.""",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar=CACHE_DIR_ENV,
+    type=click.Path(file_okay=False),
+    help="Cache results of operators in this directory and replay them for identical invocations.",
+)
+@click.option(
+    "--cache-ttl",
+    default=DEFAULT_TTL,
+    envvar=CACHE_TTL_ENV,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds a cached result stays valid.",
+)
+@click.option(
+    "--cache-max-bytes",
+    default=DEFAULT_MAX_BYTES,
+    envvar=CACHE_MAX_BYTES_ENV,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Size of the result cache beyond which the least recently used results are evicted.",
+)
+@click.option(
+    "--log-format",
+    default=None,
+    envvar=LOG_FORMAT_ENV,
+    type=click.Choice(["text", "json"]),
+    help="""Write operator logs from a background thread, as text or as JSON Lines with the task_id and
+phase of each record.""",
+)
+@click.option(
+    "--log-dir",
+    default=None,
+    envvar=LOG_DIR_ENV,
+    type=click.Path(file_okay=False),
+    help="Also write each task's logs to '<task_id>.log' in this directory, from a background thread.",
+)
+@click.pass_context
+def cli(
+    ctx,
+    env_var,
+    variables_file,
+    metrics_json,
+    metrics_textfile,
+    profile,
+    preload,
+    render_templates,
+    cache_dir,
+    cache_ttl,
+    cache_max_bytes,
+    log_format,
+    log_dir,
+):
     """Executes Airflow operator classes as Python objects without the need for running Airflow."""
-    os.environ.update({k.upper(): v for k, v in env_var.items()})
+    set_cli_env({k.upper(): v for k, v in env_var.items()})
+    if variables_file:
+        os.environ[VARIABLES_FILE_ENV] = os.path.abspath(variables_file)
+    set_rendering_enabled(render_templates)
+    if cache_dir:
+        os.environ[CACHE_DIR_ENV] = os.path.abspath(cache_dir)
+        os.environ[CACHE_TTL_ENV] = str(cache_ttl)
+        os.environ[CACHE_MAX_BYTES_ENV] = str(cache_max_bytes)
+    if log_format:
+        os.environ[LOG_FORMAT_ENV] = log_format
+    if log_dir:
+        os.environ[LOG_DIR_ENV] = os.path.abspath(log_dir)
+    environ_changed()
+
+    metrics.profile_path = profile
+    if metrics_json:
+        ctx.call_on_close(lambda: metrics.write_json(metrics_json))
+    if metrics_textfile:
+        ctx.call_on_close(lambda: metrics.write_openmetrics(metrics_textfile))
+
+    if preload:
+        ensure_airflow_patched()
+        from execute_any_operator.operators.registry import registry
 
+        registry.preload(preload)
 
-cli.add_command(bash_operator)
-cli.add_command(arrow_hdfs_sensor)
-cli.add_command(hive_operator)
-cli.add_command(kubernetes_pod_operator)
-cli.add_command(python_operator)
-cli.add_command(remote_bash_operator)
-cli.add_command(s3_key_sensor)
-cli.add_command(simple_http_operator)
 
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,11 @@
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
-from execute_any_operator.utils.helpers import _remove_unused_kwargs
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.batch import write_record
+from execute_any_operator.utils.helpers import (
+    _execute_sensor,
+    _remove_unused_kwargs,
+    _sensor_mode_options,
+)
 
 
 @click.command()
@@ -29,13 +34,69 @@ from execute_any_operator.utils.helpers import _remove_unused_kwargs
     default=False,
     help="Allow progressive longer waits between pokes by using exponential backoff algorithm.",
 )
-@click.argument("filepath", required=True)
-def arrow_hdfs_sensor(filepath, **kwargs):
-    """Apache PyArrow based HDFS sensor with Python3 Kerberos support."""
+@click.option(
+    "-f",
+    "--paths-file",
+    default=None,
+    type=click.File("r"),
+    help="File with one path per line, checked in addition to the FILEPATH arguments.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to write one JSON status record per path to when checking several paths. Defaults to stdout.",
+)
+@_sensor_mode_options
+@click.argument("filepath", nargs=-1)
+def arrow_hdfs_sensor(filepath, paths_file, output, mode, state_file, **kwargs):
+    """Apache PyArrow based HDFS sensor with Python3 Kerberos support.
+
+    Several paths, or a --paths-file, are checked together over one filesystem connection,
+    with one listing per directory each poke.
+    """
+    paths = list(filepath)
+    if paths_file is not None:
+        paths.extend(line.strip() for line in paths_file if line.strip())
+    if not paths:
+        raise click.UsageError("No paths given")
+    if len(paths) > 1 or paths_file is not None:
+        if mode == "reschedule" or state_file is not None:
+            raise click.UsageError("--mode reschedule and --state-file are not supported when checking several paths")
+        _check_paths(paths, output, **kwargs)
+        return
+    filepath = paths[0]
+
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+    from execute_any_operator.utils.hdfs_bulk import ARROW_HDFS_SENSOR
+
     click.echo("Executing HdfsSensor")
     task = ExecuteAnyOperator(
-        operator="arrow_hdfs_sensor.sensor:ArrowHdfsSensor",
+        operator=ARROW_HDFS_SENSOR,
         filepath=filepath,
         **_remove_unused_kwargs(kwargs)
     )
-    task.execute()
+    _execute_sensor(task, mode, state_file)
+
+
+def _check_paths(paths, output, hdfs_conn_id, ignored_ext, ignore_copying, file_size, **kwargs):
+    ensure_airflow_patched()
+    from execute_any_operator.utils.hdfs_bulk import DEFAULT_IGNORED_EXT, check_paths, connect
+
+    click.echo(f"Checking {len(paths)} HDFS paths", err=True)
+    filesystem, working_dir = connect(hdfs_conn_id)
+    statuses, summary = check_paths(
+        filesystem,
+        paths,
+        working_dir=working_dir,
+        file_size=float(file_size) if file_size else None,
+        ignored_ext=ignored_ext.split(",") if ignored_ext else DEFAULT_IGNORED_EXT,
+        ignore_copying=ignore_copying,
+        **kwargs,
+    )
+    for status in statuses:
+        write_record(output, status)
+    click.echo(f"Found {summary['found']} of {summary['paths']} paths with {summary['listings']} listings", err=True)
+    if summary["missing"]:
+        raise click.ClickException(f"{summary['missing']} paths not found")
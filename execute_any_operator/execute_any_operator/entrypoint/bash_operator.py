@@ -1,6 +1,6 @@
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
 from execute_any_operator.utils.helpers import (
+    _execute_cached,
     _multi_tuple_to_dict,
     _remove_unused_kwargs,
 )
@@ -30,13 +30,34 @@ behavior.""",
     help="""Working directory to execute the command in.
 If None (default), the command is run in a temporary directory.""",
 )
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="""Copy the output to stdout as it arrives instead of logging it,
+keeping only the last lines in memory. Suited to commands with very large output.""",
+)
+@click.option(
+    "--tee",
+    "tee_path",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Also write the output to this file. Implies --stream.",
+)
+@click.option(
+    "--tail-lines",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Number of lines at the end of the output to return as the XCom value (default 1). Implies --stream.",
+)
 @click.argument("bash-command", required=True)
-def bash_operator(bash_command, **kwargs):
+def bash_operator(bash_command, stream, **kwargs):
     """Execute a Bash script, command or set of commands."""
+    kwargs = _remove_unused_kwargs(kwargs)
+    if stream or "tee_path" in kwargs or "tail_lines" in kwargs:
+        operator = "execute_any_operator.operators.streaming_bash:StreamingBashOperator"
+    else:
+        operator = "airflow.operators.bash:BashOperator"
+
     click.echo("Executing BashOperator")
-    task = ExecuteAnyOperator(
-        operator="airflow.operators.bash:BashOperator",
-        bash_command=bash_command,
-        **_remove_unused_kwargs(kwargs)
-    )
-    task.execute()
+    _execute_cached(operator, bash_command=bash_command, **kwargs)
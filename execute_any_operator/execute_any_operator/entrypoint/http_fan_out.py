@@ -0,0 +1,80 @@
+import json
+
+import click
+from execute_any_operator.utils.batch import write_record
+from execute_any_operator.utils.helpers import _multi_tuple_to_dict, _str_to_callable
+
+
+@click.command()
+@click.option("--method", default="POST", help="The HTTP method to use for specs that don't set one.")
+@click.option(
+    "--headers",
+    default=None,
+    multiple=True,
+    type=click.Tuple([str, str]),
+    callback=_multi_tuple_to_dict,
+    help="The HTTP headers to be added to every request.",
+)
+@click.option(
+    "--response-check",
+    default=None,
+    callback=_str_to_callable,
+    help="""A check against each 'requests' response object, in module notation (my.module:function).
+It takes the response as its only argument and should return True for 'pass' and False otherwise.""",
+)
+@click.option(
+    "--response-filter",
+    default=None,
+    callback=_str_to_callable,
+    help="""A function that takes each 'requests' response object and returns the value to record
+in place of the response text, in module notation (my.module:function).""",
+)
+@click.option(
+    "--extra-options", default=None, help="Extra options for the 'requests' library, as JSON."
+)
+@click.option(
+    "--http-conn-id",
+    default="http_default",
+    help="The http connection for specs that don't set one.",
+)
+@click.option(
+    "-n",
+    "--concurrency",
+    default=16,
+    type=click.IntRange(min=1),
+    help="Maximum number of requests in flight, which is also the connection pool size per connection.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream JSON Lines result records to. Defaults to stdout.",
+)
+@click.argument("specs", type=click.File("r"), required=True)
+def http_fan_out(specs, output, concurrency, headers, response_check, response_filter, extra_options, **defaults):
+    """Send many HTTP requests concurrently, reusing keep-alive connections.
+
+    SPECS is a JSON Lines file with one request per line, e.g.
+    {"endpoint": "api/items/1", "method": "GET", "data": {"expand": "true"}, "headers": {"X-Request-Id": "1"}}.
+    Specs can also set "http_conn_id" and "extra_options". A result record with the status
+    code and the (filtered) response is written as each response arrives.
+    """
+    from execute_any_operator.utils.http_fan_out import fan_out, read_request_specs
+
+    if extra_options:
+        defaults["extra_options"] = json.loads(extra_options)
+    failed = 0
+    for record in fan_out(
+        read_request_specs(specs),
+        concurrency,
+        defaults,
+        headers=headers,
+        response_check=response_check,
+        response_filter=response_filter,
+    ):
+        write_record(output, record)
+        if record["state"] != "success":
+            failed += 1
+    if failed:
+        raise click.ClickException(f"{failed} requests failed")
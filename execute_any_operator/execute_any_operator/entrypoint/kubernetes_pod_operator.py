@@ -1,5 +1,7 @@
+import signal
+import sys
+
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
 from execute_any_operator.utils.helpers import _remove_unused_kwargs
 
 
@@ -40,11 +42,56 @@ from execute_any_operator.utils.helpers import _remove_unused_kwargs
 @click.option("--pod-runtime-info-envs", default=None, help="")
 @click.option("--termination-grace-period", default=None, help="")
 @click.option("--configmaps", default=None, help="")
-def kubernetes_pod_operator(**kwargs):
+@click.option(
+    "--shard-args",
+    default=None,
+    type=click.File("r"),
+    help="""Fan out: launch a pod per shard from the same template, with each shard's arguments in place of
+--arguments. A JSON list or a JSON Lines file with one list of arguments per shard.""",
+)
+@click.option(
+    "--max-concurrent-pods",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of shard pods running at a time with --shard-args.",
+)
+@click.option(
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream a JSON result record per shard to with --shard-args. Defaults to stdout.",
+)
+def kubernetes_pod_operator(shard_args, max_concurrent_pods, output, **kwargs):
     """Execute a task in a Kubernetes Pod."""
-    click.echo("Executing KubernetesPodOperator")
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+    click.echo("Executing KubernetesPodOperator", err=shard_args is not None)
     task = ExecuteAnyOperator(
         operator="airflow.providers.cncf.kubernetes.operators.kubernetes_pod:KubernetesPodOperator",
         **_remove_unused_kwargs(kwargs)
     )
-    task.execute()
+    if shard_args is None:
+        task.execute()
+        return
+    from execute_any_operator.utils.batch import write_record
+    from execute_any_operator.utils.kpo_fan_out import PodFanOut, read_shard_args
+    # Imported after ExecuteAnyOperator, which patches Airflow on import
+    from airflow.models.taskinstance import XCOM_RETURN_KEY
+
+    shards = read_shard_args(shard_args)
+    task.render_templates()
+    # Turn SIGTERM into an exception so that the shard pods are deleted on the way out
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    # Pod logs go to stderr so that the records can go to stdout
+    fan_out = PodFanOut(task.task, task.context, max_concurrent_pods, log_stream=sys.stderr)
+    results = [None] * len(shards)
+    failed = 0
+    for record in fan_out.run(shards):
+        write_record(output, record)
+        results[record["shard"]] = record.get("return_value")
+        failed += record["state"] != "success"
+    if task.task.do_xcom_push:
+        task.task.xcom_push(task.context, key=XCOM_RETURN_KEY, value=results)
+    if failed:
+        raise click.ClickException(f"{failed} of {len(shards)} shard pods failed")
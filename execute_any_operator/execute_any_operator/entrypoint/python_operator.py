@@ -1,6 +1,6 @@
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
 from execute_any_operator.utils.helpers import (
+    _execute_cached,
     _multi_tuple_to_dict,
     _remove_unused_kwargs,
     _str_to_callable,
@@ -26,13 +26,79 @@ from execute_any_operator.utils.helpers import (
     callback=_multi_tuple_to_dict,
     help="A dictionary of keyword arguments that will get unpacked in your function.",
 )
+@click.option(
+    "--expand",
+    "arg_sets",
+    default=None,
+    type=click.File("r"),
+    help="""A JSON list or JSON Lines file of argument sets to map the callable over, one call per set.
+An object is passed as keyword arguments and a list as positional arguments, after the fixed
+--arguments and --keyword-arguments. Any other value is passed as one positional argument.""",
+)
+@click.option(
+    "-n",
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of processes to map the callable on with --expand. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--chunk-size",
+    default=16,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of argument sets sent to a process at a time with --expand.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream a JSON result record per argument set to with --expand. Defaults to stdout.",
+)
+@click.option(
+    "--xcom/--no-xcom",
+    "push_xcom",
+    default=True,
+    help="""Push the return values as one XCom list with --expand. That list holds every return value
+in memory, so --no-xcom keeps memory bounded for large inputs and only streams the result records.""",
+)
 @click.argument("python-callable", required=True, callback=_str_to_callable)
-def python_operator(python_callable, **kwargs):
+def python_operator(python_callable, arg_sets, workers, chunk_size, output, push_xcom, **kwargs):
     """Executes a Python callable."""
-    click.echo("Executing PythonOperator")
-    task = ExecuteAnyOperator(
-        operator="airflow.operators.python:PythonOperator",
-        python_callable=python_callable,
-        **_remove_unused_kwargs(kwargs)
-    )
-    task.execute()
+    operator = "airflow.operators.python:PythonOperator"
+    kwargs = _remove_unused_kwargs(kwargs)
+    click.echo("Executing PythonOperator", err=arg_sets is not None)
+    if arg_sets is None:
+        _execute_cached(operator, python_callable=python_callable, **kwargs)
+        return
+
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+    from execute_any_operator.utils.batch import write_record
+    from execute_any_operator.utils.expand import expand, read_arg_sets
+
+    # Imported after ExecuteAnyOperator, which patches Airflow on import
+    from airflow.models.taskinstance import XCOM_RETURN_KEY
+
+    task = ExecuteAnyOperator(operator=operator, python_callable=python_callable, **kwargs)
+
+    # Return values are only kept for the XCom list; records are streamed to the output
+    push_xcom = push_xcom and task.task.do_xcom_push
+    results, calls, failed = [], 0, 0
+    for record in expand(
+        python_callable,
+        read_arg_sets(arg_sets),
+        op_args=task.task.op_args,
+        op_kwargs=task.task.op_kwargs,
+        workers=workers,
+        chunk_size=chunk_size,
+    ):
+        write_record(output, record)
+        if push_xcom:
+            results.append(record.get("return_value"))
+        calls += 1
+        failed += record["state"] != "success"
+    if push_xcom:
+        task.task.xcom_push(task.context, key=XCOM_RETURN_KEY, value=results)
+    if failed:
+        raise click.ClickException(f"{failed} of {calls} mapped calls failed")
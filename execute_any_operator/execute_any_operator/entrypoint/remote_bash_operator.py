@@ -1,9 +1,6 @@
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
 from execute_any_operator.utils.helpers import _remove_unused_kwargs
 
-from remote_bash_operator.operator import Config, EnvironmentConfigInstance
-
 
 @click.command()
 @click.option(
@@ -37,6 +34,9 @@ from remote_bash_operator.operator import Config, EnvironmentConfigInstance
 @click.argument("vcores", type=int, required=True)
 def remote_bash_operator(command, cluster, user, job_name, memory, vcores, **kwargs):
     """Execute a Bash script, command or set of commands."""
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+    from remote_bash_operator.operator import Config, EnvironmentConfigInstance
+
     click.echo("Executing RemoteBashOperator")
     task = ExecuteAnyOperator(
         operator="remote_bash_operator.operator:RemoteBashOperator",
@@ -49,5 +49,4 @@ def remote_bash_operator(command, cluster, user, job_name, memory, vcores, **kwa
         config=Config(configs=[EnvironmentConfigInstance()]),
         **_remove_unused_kwargs(kwargs)
     )
-    task.pre_execute()
     task.execute()
@@ -0,0 +1,58 @@
+import click
+from execute_any_operator.utils.batch import read_manifest, run_parallel, run_serial, write_record
+from execute_any_operator.utils.streaming import reserve_stdout
+
+
+@click.command()
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream JSON Lines result records to. Defaults to stdout.",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop at the first failed entry instead of running the rest of the manifest.",
+)
+@click.option(
+    "-n",
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of entries to run concurrently. 1 (default) runs them in order in this process.",
+)
+@click.option(
+    "--pool",
+    default="thread",
+    type=click.Choice(["thread", "process"]),
+    help="""Worker pool used when --workers is greater than 1. Threads suit I/O-bound
+operators such as HTTP calls and sensors, processes suit CPU-bound Python callables.""",
+)
+@click.argument("manifest", type=click.File("r"), required=True)
+def run_batch(manifest, output, fail_fast, workers, pool):
+    """Run every operator in a JSON Lines manifest in a single process.
+
+    Each manifest line is an object such as
+    {"operator": "airflow.operators.bash:BashOperator", "kwargs": {"bash_command": "echo hi"}}.
+    One result record is written per entry as it finishes.
+    """
+    reserve_stdout(output)
+    entries = read_manifest(manifest)
+    if workers > 1:
+        records = run_parallel(entries, workers=workers, pool=pool)
+    else:
+        records = run_serial(entries)
+
+    failed = 0
+    for record in records:
+        write_record(output, record)
+        if record["state"] != "success":
+            failed += 1
+            if fail_fast:
+                records.close()
+                break
+    if failed:
+        raise click.ClickException(f"{failed} manifest entries failed")
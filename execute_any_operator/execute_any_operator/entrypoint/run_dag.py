@@ -0,0 +1,44 @@
+import click
+from execute_any_operator.utils.batch import write_record
+from execute_any_operator.utils.streaming import reserve_stdout
+
+
+@click.command()
+@click.option(
+    "-d",
+    "--dag-id",
+    default=None,
+    help="DAG to run when GRAPH is a Python file defining more than one DAG.",
+)
+@click.option(
+    "-n",
+    "--workers",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Maximum number of tasks running at the same time.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream JSON Lines task records to. Defaults to stdout.",
+)
+@click.argument("graph", type=click.Path(exists=True, dir_okay=False), required=True)
+def run_dag(graph, dag_id, workers, output):
+    """Run a graph of operators, starting each task as soon as its upstream tasks finish.
+
+    GRAPH is either a JSON/YAML file with a list of tasks, each with a task_id, an operator
+    in module notation, kwargs, upstream task ids and an optional trigger_rule, or a
+    Python file defining an Airflow DAG.
+    """
+    from execute_any_operator.utils.dag_runner import FAILED, UPSTREAM_FAILED, load_graph, run_graph
+
+    reserve_stdout(output)
+    failed = 0
+    for record in run_graph(load_graph(graph, dag_id=dag_id), workers=workers):
+        write_record(output, record)
+        if record["state"] in (FAILED, UPSTREAM_FAILED):
+            failed += 1
+    if failed:
+        raise click.ClickException(f"{failed} tasks failed")
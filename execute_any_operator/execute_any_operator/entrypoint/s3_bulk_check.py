@@ -0,0 +1,82 @@
+import click
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.batch import write_record
+
+
+@click.command()
+@click.option(
+    "--bucket-name",
+    default=None,
+    help="Name of the S3 bucket. Only needed when keys are not provided as full s3:// urls.",
+)
+@click.option(
+    "--wildcard-match",
+    default=False,
+    help="Whether the keys should be interpreted as Unix wildcard patterns.",
+)
+@click.option(
+    "--aws-conn-id", default="aws_default", help="A reference to the s3 connection."
+)
+@click.option(
+    "--verify",
+    default=None,
+    help="Whether or not to verify SSL certificates for S3 connection. By default SSL certificates are verified.",
+)
+@click.option(
+    "--poke-interval",
+    default=60,
+    help="Time in seconds that the job should wait in between each tries.",
+)
+@click.option(
+    "--timeout",
+    default=60 * 60 * 24 * 7,
+    help="Time, in seconds before the task times out and fails.",
+)
+@click.option(
+    "--exponential-backoff",
+    default=False,
+    help="Allow progressive longer waits between pokes by using exponential backoff algorithm.",
+)
+@click.option(
+    "-f",
+    "--keys-file",
+    default=None,
+    type=click.File("r"),
+    help="File with one key per line, checked in addition to the KEYS arguments.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to write one JSON status record per key to. Defaults to stdout.",
+)
+@click.argument("keys", nargs=-1)
+def s3_bulk_check(keys, keys_file, output, aws_conn_id, verify, **kwargs):
+    """Waits for many keys to be present in S3, listing ranges of keys rather than heading each key.
+
+    Keys sharing a bucket and prefix are resolved together with paginated ListObjectsV2
+    calls over the range between the first and last missing key.
+    """
+    ensure_airflow_patched()
+    from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+    from execute_any_operator.utils.s3_bulk import check_keys
+
+    keys = list(keys)
+    if keys_file is not None:
+        keys.extend(line.strip() for line in keys_file if line.strip())
+    if not keys:
+        raise click.UsageError("No keys given")
+
+    click.echo(f"Checking {len(keys)} S3 keys", err=True)
+    client = S3Hook(aws_conn_id=aws_conn_id, verify=verify).get_conn()
+    statuses, summary = check_keys(client, keys, **kwargs)
+    for status in statuses:
+        write_record(output, status)
+    click.echo(
+        f"Found {summary['found']} of {summary['keys']} keys with {summary['list_requests']} list"
+        f" and {summary['head_requests']} head requests",
+        err=True,
+    )
+    if summary["missing"]:
+        raise click.ClickException(f"{summary['missing']} keys not found")
@@ -1,7 +1,9 @@
 import click
-from airflow.exceptions import AirflowSensorTimeout
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
-from execute_any_operator.utils.helpers import _remove_unused_kwargs
+from execute_any_operator.utils.helpers import (
+    _execute_sensor,
+    _remove_unused_kwargs,
+    _sensor_mode_options,
+)
 
 
 @click.command()
@@ -38,12 +40,16 @@ from execute_any_operator.utils.helpers import _remove_unused_kwargs
     default=False,
     help="Allow progressive longer waits between pokes by using exponential backoff algorithm.",
 )
+@_sensor_mode_options
 @click.argument("bucket-key", required=True)
-def s3_key_sensor(bucket_key, **kwargs):
+def s3_key_sensor(bucket_key, mode, state_file, **kwargs):
     """Waits for a key (a file-like instance on S3) to be present in a S3 bucket.
     S3 being a key/value it does not support folders. The path is just a key
     a resource.
     """
+    from airflow.exceptions import AirflowSensorTimeout
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
     click.echo("Executing S3KeySensor")
     task = ExecuteAnyOperator(
         operator="airflow.providers.amazon.aws.sensors.s3_key:S3KeySensor",
@@ -51,7 +57,7 @@ def s3_key_sensor(bucket_key, **kwargs):
         **_remove_unused_kwargs(kwargs),
     )
     try:
-        task.execute()
+        _execute_sensor(task, mode, state_file)
         click.echo(f"File '{bucket_key}' exists")
     except AirflowSensorTimeout:
         click.echo(f"File '{bucket_key}' not found")
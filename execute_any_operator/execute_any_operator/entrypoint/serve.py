@@ -0,0 +1,75 @@
+import json
+import sys
+
+import click
+from execute_any_operator.utils.fork_server import DEFAULT_SOCKET
+from execute_any_operator.utils.helpers import _multi_tuple_to_dict
+
+_socket_option = click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    default=DEFAULT_SOCKET,
+    envvar="EXECUTE_ANY_OPERATOR_SOCKET",
+    show_default=True,
+    help="Path of the daemon's Unix socket.",
+)
+
+
+@click.command()
+@_socket_option
+@click.option(
+    "-p",
+    "--preload",
+    default=None,
+    multiple=True,
+    help="Operator to import up front, in module notation (my.module:OperatorClass).",
+)
+def serve(socket_path, preload):
+    """Run a pre-warmed daemon that executes operators submitted over a Unix socket.
+
+    Airflow is imported once and a fresh child process is forked for every job.
+    """
+    from execute_any_operator.utils.fork_server import serve as serve_forever
+
+    click.echo(f"Serving on {socket_path}")
+    try:
+        serve_forever(socket_path, preload=preload)
+    except FileExistsError as e:
+        raise click.ClickException(str(e))
+
+
+@click.command()
+@_socket_option
+@click.option(
+    "-k",
+    "--kwargs",
+    "operator_kwargs",
+    default="{}",
+    help="JSON object of keyword arguments for the operator.",
+)
+@click.option("-t", "--task-id", default=None, help="Task id for the operator.")
+@click.option(
+    "-e",
+    "--env",
+    default=None,
+    multiple=True,
+    type=click.Tuple([str, str]),
+    callback=_multi_tuple_to_dict,
+    help="Environment variables visible to this job only.",
+)
+@click.argument("operator", required=True)
+def submit(socket_path, operator, operator_kwargs, task_id, env):
+    """Submit an operator to a running `serve` daemon.
+
+    Job logs are streamed to stderr. The result record, including the return value and
+    XComs, is printed to stdout and the command exits with the job's exit code.
+    """
+    from execute_any_operator.utils.fork_server import submit as submit_job
+
+    request = {"operator": operator, "kwargs": json.loads(operator_kwargs), "env": env}
+    if task_id is not None:
+        request["task_id"] = task_id
+    result = submit_job(request, socket_path=socket_path)
+    click.echo(json.dumps(result["record"], default=str))
+    sys.exit(result["exit_code"])
@@ -1,7 +1,8 @@
+import json
+
 import click
-from execute_any_operator.operators.execute_any import ExecuteAnyOperator
-from execute_any_operator.utils.dict_xcom_backend import XComData
 from execute_any_operator.utils.helpers import (
+    _execute_cached,
     _multi_tuple_to_dict,
     _remove_unused_kwargs,
     _str_to_callable,
@@ -57,10 +58,17 @@ and optionally any number of keyword arguments available in the context dictiona
 # @click.option("--auth-type", default=None, help="The auth type for the service.")
 def simple_http_operator(**kwargs):
     click.echo("Executing SimpleHttpOperator")
-    task = ExecuteAnyOperator(
-        operator="airflow.providers.http.operators.http:SimpleHttpOperator",
+    result = _execute_cached(
+        "airflow.providers.http.operators.http:SimpleHttpOperator",
         **_remove_unused_kwargs(kwargs)
     )
-    task.execute()
     print("======= XCOM DATA =======")
-    print(XComData)
+    if result["cached"]:
+        # The same {dag_id: {task_id: {key: value}}} structure as XComData, with values
+        # serialized as BaseXCom.serialize_value does for JSON values
+        xcom = {key: json.dumps(value).encode("UTF-8") for key, value in result["xcom"].items()}
+        print({result["dag_id"]: {result["task_id"]: xcom}})
+    else:
+        from execute_any_operator.utils.dict_xcom_backend import XComData
+
+        print(XComData)
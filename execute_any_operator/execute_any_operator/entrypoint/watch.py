@@ -0,0 +1,42 @@
+import asyncio
+
+import click
+from execute_any_operator.utils.batch import read_manifest, write_record
+from execute_any_operator.utils.watch import watch as watch_sensors
+
+
+@click.command()
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="File to stream JSON Lines result records to. Defaults to stdout.",
+)
+@click.option(
+    "-n",
+    "--workers",
+    default=16,
+    type=click.IntRange(min=1),
+    help="Maximum number of pokes running at the same time.",
+)
+@click.argument("specs", type=click.File("r"), required=True)
+def watch(specs, output, workers):
+    """Watch many sensors from one process until each one succeeds or times out.
+
+    SPECS is a JSON Lines file in the run-batch manifest format, one sensor per line, e.g.
+    {"operator": "airflow.providers.amazon.aws.sensors.s3_key:S3KeySensor", "kwargs": {"bucket_key": "s3://bucket/key", "poke_interval": 30}}.
+    A result record is written as each sensor resolves.
+    """
+
+    async def run():
+        unresolved = 0
+        async for record in watch_sensors(read_manifest(specs), workers=workers):
+            write_record(output, record)
+            if record["state"] not in ("success", "skipped"):
+                unresolved += 1
+        return unresolved
+
+    unresolved = asyncio.run(run())
+    if unresolved:
+        raise click.ClickException(f"{unresolved} sensors timed out or failed")
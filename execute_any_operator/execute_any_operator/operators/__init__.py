@@ -0,0 +1,10 @@
+import importlib
+
+
+def ensure_airflow_patched() -> None:
+    """Import Airflow with ``context_patches`` applied, if this process hasn't yet.
+
+    Code that uses Airflow outside of ``ExecuteAnyOperator`` calls this first, and code that
+    uses it from worker threads calls it up front, so that the threads don't race on the import.
+    """
+    importlib.import_module("execute_any_operator.operators.execute_any")
@@ -1,27 +1,59 @@
+import contextvars
+import cProfile
 import functools
 import importlib
-import inspect
 import logging
+import sys
+import threading
+import time
 from contextlib import ExitStack
-from typing import Any, TypeVar
+from typing import Any, TypeVar, Union
 from unittest.mock import MagicMock
 
-import pendulum
-from execute_any_operator.utils.mock import context_patches
+from execute_any_operator.utils.context import LazyContext
+from execute_any_operator.utils.logs import configure_logging
+from execute_any_operator.utils.metrics import log_scope, metrics
+
+_import_started = time.perf_counter()
+
+import pendulum  # noqa: E402
+from execute_any_operator.utils.mock import context_patches  # noqa: E402
 
 with ExitStack() as stack:
     managers = [stack.enter_context(patch) for patch in context_patches]
 
     import remote_bash_operator.operator
-    from airflow import macros
+    from airflow.exceptions import (
+        AirflowFailException,
+        AirflowSensorTimeout,
+        AirflowSkipException,
+        AirflowTaskTimeout,
+    )
     from airflow.models.baseoperator import BaseOperator
-    from airflow.models.dag import DAG
     from airflow.models.taskinstance import XCOM_RETURN_KEY, TaskInstance
+    from airflow.utils.timeout import timeout
+    from execute_any_operator.operators.registry import parse_operator_path, registry
+    from execute_any_operator.utils.retry import retry_delay
+    from execute_any_operator.utils.templating import render_template_fields, rendering_enabled
+
+metrics.add_span("import", _import_started, time.perf_counter())
+
+# Airflow configures logging on import, so the queued pipeline wraps its handlers
+configure_logging()
 
 TBaseOperator = TypeVar("TBaseOperator", bound=BaseOperator)
 
+# Failures that Airflow never retries
+NON_RETRYABLE_EXCEPTIONS = (AirflowFailException, AirflowSensorTimeout, AirflowSkipException)
+
 log = logging.getLogger(__name__)
 
+# Seconds a timed out attempt off the main thread gets to stop after on_kill
+KILL_GRACE_PERIOD = 10
+
+_SINGLE_PROFILER = sys.version_info >= (3, 12)
+_profiler_lock = threading.Lock()
+
 
 # TODO: remove these mocks when maven is installed
 remote_bash_operator.operator.maven_install = MagicMock()
@@ -32,12 +64,11 @@ def make_kwargs(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         operator = kwargs["operator"]
-        try:
-            mod_name, op_name = operator.split(":", 1)
-        except ValueError:
-            raise ValueError(
-                f"Operator string {operator} improperly formatted, must be in module notation (my.module:OperatorClass)"
-            )
+        if isinstance(operator, BaseOperator):
+            mod_name, op_name = None, type(operator).__name__
+            kwargs.setdefault("task_id", operator.task_id)
+        else:
+            mod_name, op_name = parse_operator_path(operator)
 
         kwargs["mod_name"] = mod_name
         kwargs["op_name"] = op_name
@@ -51,76 +82,183 @@ def make_kwargs(func):
 
 
 class ExecuteAnyOperator(BaseOperator):
+    """Executes an operator outside of Airflow.
+
+    :param operator: The operator class in module notation (my.module:OperatorClass), which is
+        initialized with the remaining keyword arguments, or an already initialized operator,
+        e.g. a task loaded from a DAG file.
+    """
+
     @make_kwargs
-    def __init__(self, operator: str, *args, **kwargs):
-        params = inspect.signature(BaseOperator).parameters
-        base_kwargs = {k: kwargs[k] for k in params if k in kwargs}
-        super().__init__(**base_kwargs)
-
-        mod_name = kwargs.pop("mod_name")
-        op_name = kwargs.pop("op_name")
-        self.operator = getattr(importlib.import_module(mod_name), op_name)
-
-        self.dag = DAG(
-            "dummy_dag",
-            default_args={
-                "owner": "airflow",
-                "start_date": pendulum.today(tz="UTC").subtract(days=1),
+    def __init__(self, operator: Union[str, BaseOperator], *args, **kwargs):
+        # Everything logged while the task is built goes to the task's log
+        with log_scope("construct", kwargs["task_id"]):
+            construct_started = time.perf_counter()
+            kwargs.pop("mod_name")
+            kwargs.pop("op_name")
+            if isinstance(operator, BaseOperator):
+                self.operator = type(operator)
+            else:
+                self.operator = registry.resolve(operator)
+            base_kwargs, operator_kwargs = registry.split_kwargs(self.operator, kwargs)
+            super().__init__(**base_kwargs)
+
+            self.start_date = kwargs["start_date"]
+            self.task = operator if isinstance(operator, BaseOperator) else self.operator(**operator_kwargs)
+            self.task._log = log
+            metrics.add_span("construct", construct_started, time.perf_counter(), self.task_id)
+            with metrics.span("generate_context", self.task_id):
+                self.context = self._generate_context()
+            self.templates_rendered = False
+
+    def _generate_context(self) -> LazyContext:
+        start_date = self.start_date
+        dag = self.task.dag if self.task.has_dag() else registry.dag()
+        # Only computed when an operator or template reads them
+        factories = {
+            "ds": start_date.to_date_string,
+            "ds_nodash": lambda: start_date.strftime("%Y%m%d"),
+            "ts": start_date.isoformat,
+            "ts_nodash": lambda: start_date.strftime("%Y%m%dT%H%M%S"),
+            "ts_nodash_with_tz": lambda: context["ts"].replace("-", "").replace(":", ""),
+            "task_instance": lambda: TaskInstance(
+                task=self.task, execution_date=start_date, run_id=f"cli__{context['ts_nodash']}"
+            ),
+            "ti": lambda: context["task_instance"],
+            "task_instance_key_str": lambda: f"{dag.dag_id}__{self.task_id}__{context['ds_nodash']}",
+            "macros": lambda: importlib.import_module("airflow.macros"),
+        }
+        context = LazyContext(
+            {
+                "conf": None,
+                "dag": dag,
+                "dag_run": None,
+                "data_interval_end": None,
+                "data_interval_start": start_date,
+                "inlets": None,
+                "outlets": None,
+                "params": None,
+                "prev_data_interval_start_success": None,
+                "prev_data_interval_end_success": None,
+                "prev_execution_date_success": None,
+                "run_id": None,
+                "task": self.task,
+                "test_mode": False,
+                "var": None,
+                "conn": None,
             },
-            schedule_interval=None,
-        )
-        self.start_date = kwargs["start_date"]
-        self.task = self.operator(**kwargs)
-        self.task._log = log
-        self.context = self._generate_context()
-
-    def _generate_context(self):
-        ds = self.start_date.to_date_string()
-        ds_nodash = ds.replace("-", "")
-        ts = self.start_date.isoformat()
-        ts_nodash = self.start_date.strftime("%Y%m%dT%H%M%S")
-        ts_nodash_with_tz = ts.replace("-", "").replace(":", "")
-        task_instance = TaskInstance(
-            task=self.task, execution_date=self.start_date, run_id=f"cli__{ts_nodash}"
+            factories,
         )
+        return context
 
-        return {
-            "conf": None,
-            "dag": self.dag,
-            "dag_run": None,
-            "data_interval_end": None,
-            "data_interval_start": self.start_date,
-            "ds": ds,
-            "ds_nodash": ds_nodash,
-            "inlets": None,
-            "macros": macros,
-            "outlets": None,
-            "params": None,
-            "prev_data_interval_start_success": None,
-            "prev_data_interval_end_success": None,
-            "prev_execution_date_success": None,
-            "run_id": None,
-            "task": self.task,
-            "task_instance": task_instance,
-            "task_instance_key_str": f"{self.dag.dag_id}__{self.task_id}__{ds_nodash}",
-            "test_mode": False,
-            "ti": task_instance,
-            "ts": ts,
-            "ts_nodash": ts_nodash,
-            "ts_nodash_with_tz": ts_nodash_with_tz,
-            "var": None,
-            "conn": None,
-        }
+    def render_templates(self):
+        """Render the task's template fields against the generated context, once."""
+        if self.templates_rendered or not rendering_enabled():
+            return
+        with metrics.span("render", self.task_id):
+            render_template_fields(self.task, self.context, self.task.dag if self.task.has_dag() else None)
+        self.templates_rendered = True
 
     def pre_execute(self):
-        return self.task.pre_execute(context=self.context)
+        self.render_templates()
+        with metrics.span("pre_execute", self.task_id):
+            return self.task.pre_execute(context=self.context)
 
     def post_execute(self, context: Any, result: Any = None):
-        return self.task.post_execute(context, result)
+        with metrics.span("post_execute", self.task_id):
+            return self.task.post_execute(context, result)
+
+    def _execute_task(self):
+        if metrics.profile_path is None:
+            return self.task.execute(context=self.context)
+        # Since Python 3.12 only one profiler can be active in a process at a time
+        if _SINGLE_PROFILER and not _profiler_lock.acquire(blocking=False):
+            self.log.warning(f"Not profiling {self.task_id}: another task is being profiled")
+            return self.task.execute(context=self.context)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.task.execute, context=self.context)
+        finally:
+            if _SINGLE_PROFILER:
+                _profiler_lock.release()
+            profiler.dump_stats(metrics.profile_path.format(task_id=self.task_id))
+
+    def _run_attempt(self):
+        """Execute the task once, failing with ``AirflowTaskTimeout`` after its ``execution_timeout``."""
+        if self.task.execution_timeout is None:
+            return self._execute_task()
+        seconds = self.task.execution_timeout.total_seconds()
+        # airflow.utils.timeout relies on SIGALRM, which is only delivered to the main thread
+        if threading.current_thread() is threading.main_thread():
+            with timeout(seconds):
+                return self._execute_task()
+        return self._execute_with_deadline(seconds)
+
+    def _execute_with_deadline(self, seconds: float):
+        """Execute the task on a separate thread, killing it with ``on_kill`` if it runs past ``seconds``."""
+        outcome = {}
+        # The attempt sees this thread's context: its span, env overlay and XCom store
+        context = contextvars.copy_context()
+
+        def attempt():
+            try:
+                outcome["result"] = context.run(self._execute_task)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=attempt, name=f"{self.task_id}-attempt", daemon=True)
+        thread.start()
+        thread.join(seconds)
+        if thread.is_alive():
+            # A thread can't be interrupted, so the operator is asked to stop its work, as Airflow does
+            self.task.on_kill()
+            thread.join(KILL_GRACE_PERIOD)
+            if thread.is_alive():
+                # Another attempt would run alongside this one on the same operator and context
+                raise AirflowFailException(
+                    f"Task {self.task_id} timed out after {seconds}s and was still running "
+                    f"{KILL_GRACE_PERIOD}s after on_kill, not retrying"
+                )
+            raise AirflowTaskTimeout(f"Task {self.task_id} timed out after {seconds}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def _execute_with_retries(self):
+        """Run the task's attempts in this process, honoring its retries, retry delay and execution timeout."""
+        attempts = (self.task.retries or 0) + 1
+        for try_number in range(1, attempts + 1):
+            started = time.perf_counter()
+            try:
+                self.pre_execute()
+                with metrics.span("execute", self.task_id):
+                    result = self._run_attempt()
+            except NON_RETRYABLE_EXCEPTIONS:
+                raise
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                if try_number == attempts:
+                    self.log.error(f"Attempt {try_number} of {attempts} failed after {elapsed:.3f}s: {e!r}")
+                    raise
+                delay = retry_delay(self.task, try_number)
+                self.log.warning(
+                    f"Attempt {try_number} of {attempts} failed after {elapsed:.3f}s: {e!r}. Retrying in {delay:.3f}s"
+                )
+                metrics.increment("retries")
+                with metrics.span("retry_delay", self.task_id):
+                    time.sleep(delay)
+            else:
+                self.log.info(f"Attempt {try_number} of {attempts} succeeded after {time.perf_counter() - started:.3f}s")
+                return result
 
     def execute(self):
-        self.log.info(f"ExecuteAnyOperator is executing {self.task}")
-        result = self.task.execute(context=self.context)
-        if self.task.do_xcom_push and result is not None:
-            self.task.xcom_push(self.context, key=XCOM_RETURN_KEY, value=result)
-        return result
+        # Including the wrapper's own lines, such as the attempt logs between the phases
+        with log_scope("execute", self.task_id):
+            self.render_templates()
+            self.log.info(f"ExecuteAnyOperator is executing {self.task}")
+            result = self._execute_with_retries()
+            if self.task.do_xcom_push and result is not None:
+                with metrics.span("xcom_push", self.task_id):
+                    self.task.xcom_push(self.context, key=XCOM_RETURN_KEY, value=result)
+            self.post_execute(self.context, result)
+            return result
@@ -0,0 +1,87 @@
+"""Process-wide cache of the operator classes, signatures and DAG that ExecuteAnyOperator needs for every task."""
+import importlib
+import inspect
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple, Type
+
+import pendulum
+from airflow.models.baseoperator import BaseOperator
+from airflow.models.dag import DAG
+
+BASE_OPERATOR_PARAMS: FrozenSet[str] = frozenset(inspect.signature(BaseOperator).parameters)
+
+
+def parse_operator_path(path: str) -> Tuple[str, str]:
+    try:
+        mod_name, op_name = path.split(":", 1)
+    except ValueError:
+        raise ValueError(
+            f"Operator string {path} improperly formatted, must be in module notation (my.module:OperatorClass)"
+        )
+    return mod_name, op_name
+
+
+class OperatorRegistry:
+    """Resolves each ``module:Class`` once and shares one placeholder DAG across all tasks of a run."""
+
+    def __init__(self):
+        self._operators: Dict[str, Type[BaseOperator]] = {}
+        self._params: Dict[type, Optional[FrozenSet[str]]] = {}
+        self._dag: Optional[DAG] = None
+        self._lock = threading.Lock()
+
+    def resolve(self, path: str) -> Type[BaseOperator]:
+        operator = self._operators.get(path)
+        if operator is None:
+            mod_name, op_name = parse_operator_path(path)
+            operator = getattr(importlib.import_module(mod_name), op_name)
+            with self._lock:
+                operator = self._operators.setdefault(path, operator)
+        return operator
+
+    def _operator_params(self, operator: type) -> Optional[FrozenSet[str]]:
+        """The keyword arguments ``operator`` accepts, or None if it accepts any, inspected once per class."""
+        if operator not in self._params:
+            parameters = inspect.signature(operator).parameters.values()
+            if any(param.kind == param.VAR_KEYWORD for param in parameters):
+                params = None
+            else:
+                params = frozenset(param.name for param in parameters)
+            with self._lock:
+                self._params.setdefault(operator, params)
+        return self._params[operator]
+
+    def split_kwargs(self, operator: type, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """``kwargs`` split into the ones for ``BaseOperator`` and the ones for ``operator``.
+
+        ``BaseOperator`` arguments that ``operator`` doesn't accept, e.g. the ``start_date``
+        ExecuteAnyOperator sets, are left out of the second. Any other argument is passed on.
+        """
+        base = {k: v for k, v in kwargs.items() if k in BASE_OPERATOR_PARAMS}
+        accepted = self._operator_params(operator)
+        if accepted is None:
+            return base, kwargs
+        return base, {k: v for k, v in kwargs.items() if k in accepted or k not in BASE_OPERATOR_PARAMS}
+
+    def preload(self, paths: Iterable[str]) -> None:
+        """Import and cache every operator in ``paths`` up front, e.g. before forking workers."""
+        for path in paths:
+            self.resolve(path)
+
+    def dag(self) -> DAG:
+        """The placeholder DAG used in the context of tasks that don't belong to a DAG."""
+        if self._dag is None:
+            with self._lock:
+                if self._dag is None:
+                    self._dag = DAG(
+                        "dummy_dag",
+                        default_args={
+                            "owner": "airflow",
+                            "start_date": pendulum.today(tz="UTC").subtract(days=1),
+                        },
+                        schedule_interval=None,
+                    )
+        return self._dag
+
+
+registry = OperatorRegistry()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from typing import Optional
+
+from airflow.exceptions import AirflowException, AirflowSkipException
+from airflow.operators.bash import BashOperator
+from execute_any_operator.utils.streaming import TailBuffer, output_sink, stream_output
+
+
+class StreamingBashOperator(BashOperator):
+    """A ``BashOperator`` that streams its output instead of logging it line by line.
+
+    Output (stdout and stderr) is copied to this process' stdout, and optionally to a tee
+    file, as it arrives. When stdout carries result records, e.g. in ``run-batch``, the output
+    is copied to stderr instead. Only the last ``tail_lines`` lines are kept in memory, and they are
+    returned (and pushed to XCom) in place of ``BashOperator``'s last line.
+
+    :param tee_path: A file to also write the output to.
+    :param tail_lines: Number of lines at the end of the output to return.
+    """
+
+    def __init__(self, *, tee_path: Optional[str] = None, tail_lines: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.tee_path = tee_path
+        self.tail_lines = tail_lines
+        self.sub_process: Optional[subprocess.Popen] = None
+
+    def execute(self, context):
+        if self.cwd is not None:
+            if not os.path.exists(self.cwd):
+                raise AirflowException(f"Can not find the cwd: {self.cwd}")
+            if not os.path.isdir(self.cwd):
+                raise AirflowException(f"The cwd {self.cwd} must be a directory")
+        env = self.get_env(context)
+
+        with TemporaryDirectory(prefix="airflowtmp") as tmp_dir:
+            exit_code, tail = self._run(env, self.cwd or tmp_dir)
+
+        if self.skip_exit_code is not None and exit_code == self.skip_exit_code:
+            raise AirflowSkipException(f"Bash command returned exit code {self.skip_exit_code}. Skipping.")
+        if exit_code != 0:
+            raise AirflowException(f"Bash command failed. The command returned a non-zero exit code {exit_code}.")
+        return "\n".join(line.decode(self.output_encoding, errors="replace").rstrip() for line in tail)
+
+    def _run(self, env, cwd):
+        def pre_exec():
+            # Restore default signal disposition and invoke setsid
+            for sig in ("SIGPIPE", "SIGXFSZ"):
+                if hasattr(signal, sig):
+                    signal.signal(getattr(signal, sig), signal.SIG_DFL)
+            os.setsid()
+
+        self.log.info("Running command: %s", self.bash_command)
+        self.sub_process = subprocess.Popen(
+            [shutil.which("bash") or "bash", "-c", self.bash_command],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=cwd,
+            env=env,
+            preexec_fn=pre_exec,
+        )
+        tail = TailBuffer(self.tail_lines)
+        sink = output_sink()
+        sinks = [sink]
+        tee = open(self.tee_path, "wb") if self.tee_path else None
+        if tee is not None:
+            sinks.append(tee)
+        try:
+            (sys.stderr if sink is sys.stderr.buffer else sys.stdout).flush()
+            copied = stream_output(self.sub_process.stdout.fileno(), sinks, tail)
+        finally:
+            if tee is not None:
+                tee.close()
+            self.sub_process.stdout.close()
+            exit_code = self.sub_process.wait()
+        self.log.info("Command exited with return code %s after %s bytes of output", exit_code, copied)
+        return exit_code, tail.tail()
+
+    def on_kill(self) -> None:
+        if self.sub_process and self.sub_process.poll() is None:
+            self.log.info("Sending SIGTERM signal to process group")
+            os.killpg(os.getpgid(self.sub_process.pid), signal.SIGTERM)
@@ -1,10 +1,100 @@
+import functools
 import importlib
 import os
 import re
-from typing import Union
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple, Union
 
+from execute_any_operator.utils.isolation import environ_version, getenv, task_overlay
+from sqlalchemy.sql import operators
 from sqlalchemy.sql.expression import BinaryExpression, BindParameter
 
+CONN_PREFIX = "AIRFLOW_CONN_"
+
+
+@functools.lru_cache(maxsize=256)
+def _like_to_regex(pattern: str):
+    # SQL LIKE: % matches any run of characters, _ matches exactly one
+    return re.compile("^" + "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern) + "$")
+
+
+# Connection fields kept per parsed URI, to build a fresh Connection from
+_CONNECTION_FIELDS = ("conn_type", "description", "host", "login", "password", "schema", "port", "extra")
+
+
+class ConnectionIndex:
+    """An index of the ``AIRFLOW_CONN_*`` env vars with cached, parsed connection fields.
+
+    The set of connection names is built from one scan of ``os.environ`` and rebuilt only
+    when the environment changes. URIs are always read fresh, and their parsed fields are
+    cached per ``(conn_id, uri)`` so a changed URI is never served stale. Every lookup gets
+    its own ``Connection``, so a task changing one can't affect others.
+    """
+
+    def __init__(self, max_cached_connections: int = 1024):
+        self._lock = threading.Lock()
+        self._version = None
+        self._names: Tuple[str, ...] = ()
+        self._fields: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._max_cached_connections = max_cached_connections
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._fields.clear()
+
+    def _conn_ids(self) -> List[str]:
+        version = environ_version()
+        if version != self._version:
+            with self._lock:
+                self._names = tuple(sorted(k[len(CONN_PREFIX):].lower() for k in os.environ if k.startswith(CONN_PREFIX)))
+                self._fields.clear()
+                self._version = version
+        names = self._names
+        overlay = task_overlay()
+        if overlay:
+            extra = {k[len(CONN_PREFIX):].lower() for k in overlay if k.startswith(CONN_PREFIX)}
+            names = tuple(sorted(extra.union(names)))
+        return list(names)
+
+    def _connection(self, conn_id: str):
+        uri = getenv(f"{CONN_PREFIX}{conn_id.upper()}")
+        if uri is None:
+            return None
+        Connection = getattr(importlib.import_module("airflow.models"), "Connection")
+        key = (conn_id, uri)
+        with self._lock:
+            fields = self._fields.get(key)
+            if fields is not None:
+                self._fields.move_to_end(key)
+        if fields is None:
+            parsed = Connection(conn_id=conn_id, uri=uri)
+            fields = {name: getattr(parsed, name) for name in _CONNECTION_FIELDS}
+            with self._lock:
+                self._fields[key] = fields
+                if len(self._fields) > self._max_cached_connections:
+                    self._fields.popitem(last=False)
+        return Connection(conn_id=conn_id, **fields)
+
+    def get(self, conn_id: str) -> list:
+        connection = self._connection(conn_id.lower())
+        return [connection] if connection is not None else []
+
+    def like(self, pattern: str) -> list:
+        regex = _like_to_regex(pattern.lower())
+        return [c for c in (self._connection(name) for name in self._conn_ids() if regex.match(name)) if c is not None]
+
+    def all(self) -> list:
+        return [c for c in map(self._connection, self._conn_ids()) if c is not None]
+
+
+connection_index = ConnectionIndex()
+
+
+def _is_connection_model(model) -> bool:
+    return isinstance(model, str) and model == "connection" or getattr(model, "__tablename__", None) == "connection"
+
 
 class mockFilter:
     def __init__(self, _model, _filter):
@@ -24,14 +114,12 @@ class mockFilter:
         return None
 
     def all(self):
-        models = importlib.import_module('airflow.models')
-        if isinstance(self._model, str) and self._model == "connection" or self._model.__tablename__ == "connection":
-            Connection = getattr(models, "Connection")
+        if _is_connection_model(self._model):
             filter_value: Union[str, None] = self._get_filter_value()
             if filter_value:
-                filter_regex = f"^AIRFLOW_CONN_{filter_value.upper().replace('%', '.*').replace('_', '.')}$"
-                connections = {k.replace("AIRFLOW_CONN_", "").lower(): v for k, v in os.environ.items() if re.search(filter_regex, k)}
-                return [Connection(conn_id=k, uri=v) for k, v in connections.items()]
+                if self._filter.operator in (operators.like_op, operators.ilike_op):
+                    return connection_index.like(filter_value)
+                return connection_index.get(filter_value)
         return []
 
     def count(self):
@@ -46,12 +134,8 @@ class mockQuery:
         return mockFilter(self._model, _filter)
 
     def all(self):
-        models = importlib.import_module('airflow.models')
-        if isinstance(self._model, str) and self._model == "connection" or self._model.__tablename__ == "connection":
-            Connection = getattr(models, "Connection")
-            filter_regex = "^AIRFLOW_CONN_.+$"
-            connections = {k.replace("AIRFLOW_CONN_", "").lower(): v for k, v in os.environ.items() if re.search(filter_regex, k)}
-            return [Connection(conn_id=k, uri=v) for k, v in connections.items()]
+        if _is_connection_model(self._model):
+            return connection_index.all()
         return []
 
     def count(self):
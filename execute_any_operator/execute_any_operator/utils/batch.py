@@ -0,0 +1,222 @@
+"""Run many operator invocations described by a JSON Lines manifest in one process."""
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import copy_context
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.helpers import _execute_cached, _str_to_callable
+from execute_any_operator.utils.isolation import isolated_env
+
+# Manifest kwargs that name a callable in "module:function" notation
+CALLABLE_KWARGS = ("python_callable", "response_check", "response_filter")
+
+
+def read_manifest(manifest: IO[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(index, entry)`` for every non-blank line of a JSON Lines manifest.
+
+    Each entry looks like ``{"operator": "my.module:OperatorClass", "kwargs": {...}}``
+    and may also set ``task_id`` and an ``env`` mapping private to that entry.
+    """
+    index = 0
+    for line_no, line in enumerate(manifest, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Manifest line {line_no} is not valid JSON: {e}")
+        if not isinstance(entry, dict) or "operator" not in entry:
+            raise ValueError(f"Manifest line {line_no} must be an object with an 'operator' key")
+        yield index, entry
+        index += 1
+
+
+def _entry_kwargs(index: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+    kwargs = dict(entry.get("kwargs") or {})
+    for name in CALLABLE_KWARGS:
+        if isinstance(kwargs.get(name), str):
+            kwargs[name] = _str_to_callable(None, None, kwargs[name])
+    if "task_id" in entry:
+        kwargs["task_id"] = entry["task_id"]
+    elif "task_id" not in kwargs:
+        op_name = entry["operator"].rsplit(":", 1)[-1]
+        kwargs["task_id"] = f"execute_{op_name}_{index}"
+    return kwargs
+
+
+def run_entry(index: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute one manifest entry and return its result record. Failures are recorded, not raised."""
+    record = {"index": index, "operator": entry.get("operator"), "task_id": None, "state": "failed"}
+    started = time.perf_counter()
+    try:
+        kwargs = _entry_kwargs(index, entry)
+        record["task_id"] = kwargs["task_id"]
+        result = _execute_cached(entry["operator"], **kwargs)
+        record.update((key, result[key]) for key in ("return_value", "xcom", "cached"))
+        record["state"] = "success"
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def run_entry_isolated(index: int, entry: Dict[str, Any], apply_env_to_process: bool = False) -> Tuple[Dict[str, Any], Any]:
+    """Execute one manifest entry with its own env overlay and XCom store.
+
+    Returns the result record and the entry's XCom store, to be merged by the caller.
+    """
+    from execute_any_operator.utils.dict_xcom_backend import isolated_xcom
+
+    with isolated_env(entry.get("env"), apply_to_process=apply_env_to_process), isolated_xcom() as store:
+        record = run_entry(index, entry)
+    return record, store
+
+
+def _run_in_process(index: int, entry: Dict[str, Any]) -> bytes:
+    # A pool process runs one entry at a time, so the env can go into os.environ safely
+    record, store = run_entry_isolated(index, entry, apply_env_to_process=True)
+    # Pickled here so that a result that can't be sent back fails only its own entry
+    try:
+        return pickle.dumps((record, store))
+    except Exception as e:
+        failed = _failed_record(index, entry, e, task_id=record["task_id"])
+        failed["duration"] = record["duration"]
+        return pickle.dumps((failed, None))
+
+
+def _failed_record(index: int, entry: Dict[str, Any], error: BaseException, task_id: Any = None) -> Dict[str, Any]:
+    """The record of an entry whose result never made it back, e.g. because its worker was killed."""
+    return {
+        "index": index,
+        "operator": entry.get("operator"),
+        "task_id": task_id or entry.get("task_id"),
+        "state": "failed",
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def _check_thread_env(entry: Dict[str, Any]) -> None:
+    """Reject an ``env`` that a thread can't give an entry without setting it for the whole process.
+
+    Only ``Variable.get`` and connection lookups see a thread's overlay. Subprocesses and SDKs
+    read ``os.environ``, and Airflow reads connections set there before the overlay.
+    """
+    unsupported = sorted(
+        key
+        for key in (key.upper() for key in entry.get("env") or {})
+        if not key.startswith(("AIRFLOW_VAR_", "AIRFLOW_CONN_")) or (key.startswith("AIRFLOW_CONN_") and key in os.environ)
+    )
+    if unsupported:
+        raise ValueError(
+            f"env variables {', '.join(unsupported)} can't be set for a single entry with --pool thread, "
+            "use --pool process or run the entries one after another"
+        )
+
+
+def run_serial(entries: Iterable[Tuple[int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Run manifest entries one after another, yielding each record as it finishes.
+
+    Like ``run_parallel``, each entry's XComs are collected in isolation and merged into the
+    global ``XComData`` in manifest order once every entry has finished, or when the generator
+    is closed early. An entry's ``env`` is set in ``os.environ`` while it runs.
+    """
+    from execute_any_operator.utils.dict_xcom_backend import merge_xcom
+
+    stores = []
+    try:
+        for index, entry in entries:
+            record, store = run_entry_isolated(index, entry, apply_env_to_process=True)
+            stores.append(store)
+            yield record
+    finally:
+        for store in stores:
+            merge_xcom(store)
+
+
+def _warm_up(render_templates: Optional[bool] = None) -> None:
+    ensure_airflow_patched()
+    from execute_any_operator.operators.registry import registry
+    from execute_any_operator.utils.templating import set_rendering_enabled
+
+    # Workers that aren't forked don't inherit the CLI's settings
+    if render_templates is not None:
+        set_rendering_enabled(render_templates)
+    registry.dag()
+
+
+def _executor(pool: str, workers: int) -> Executor:
+    if pool == "process":
+        from execute_any_operator.utils.templating import rendering_enabled
+
+        return ProcessPoolExecutor(max_workers=workers, initializer=_warm_up, initargs=(rendering_enabled(),))
+    if pool == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown pool type: {pool}")
+
+
+def run_parallel(entries: Iterable[Tuple[int, Dict[str, Any]]], workers: int, pool: str = "thread") -> Iterator[Dict[str, Any]]:
+    """Run manifest entries on a pool of ``workers``, yielding records as entries finish.
+
+    At most ``workers * 2`` entries are in flight, so large manifests are never fully
+    materialized. Each entry's XComs are collected in isolation and merged into the
+    global ``XComData`` in manifest order once every entry has finished, or, when the
+    generator is closed early, once the running entries have finished. Entries that
+    haven't started by then are dropped.
+    """
+    from execute_any_operator.utils.dict_xcom_backend import merge_xcom
+
+    _warm_up()
+    stores = {}
+    pending: Dict[Future, Tuple[int, Dict[str, Any]]] = {}
+
+    def collect(return_when):
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            index, entry = pending.pop(future)
+            try:
+                result = future.result()
+                record, store = pickle.loads(result) if pool == "process" else result
+            except Exception as e:
+                record, store = _failed_record(index, entry, e), None
+            if store is not None:
+                stores[index] = store
+            yield record
+
+    try:
+        with _executor(pool, workers) as executor:
+            try:
+                for index, entry in entries:
+                    try:
+                        if pool == "process":
+                            future = executor.submit(_run_in_process, index, entry)
+                        else:
+                            _check_thread_env(entry)
+                            # Each thread task runs in a copy of the current context so its overlays stay private
+                            future = executor.submit(copy_context().run, run_entry_isolated, index, entry)
+                    except (BrokenProcessPool, ValueError) as e:
+                        yield _failed_record(index, entry, e)
+                        continue
+                    pending[future] = (index, entry)
+                    if len(pending) >= workers * 2:
+                        yield from collect(FIRST_COMPLETED)
+                while pending:
+                    yield from collect(FIRST_COMPLETED)
+            except GeneratorExit:
+                # Closed early, e.g. by --fail-fast
+                for future in pending:
+                    future.cancel()
+                raise
+    finally:
+        for index in sorted(stores):
+            merge_xcom(stores[index])
+
+
+def write_record(output: IO[str], record: Dict[str, Any]) -> None:
+    output.write(json.dumps(record, default=str) + "\n")
+    output.flush()
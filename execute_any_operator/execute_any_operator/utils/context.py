@@ -0,0 +1,57 @@
+"""A task context whose expensive entries are only computed when an operator reads them."""
+import functools
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional
+
+
+class LazyContext(MutableMapping):
+    """A mapping of eager values plus factories that are called once, on first access.
+
+    Membership tests and iterating over keys never call a factory. Reading a value (including
+    via ``items()``, ``values()`` or ``dict(context)``) computes it once, and copies share the
+    computed value, so e.g. ``ti`` is the same object in a copy of the context.
+    """
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        self._values: Dict[str, Any] = dict(values or {})
+        self._factories: Dict[str, Callable[[], Any]] = {
+            key: factory if hasattr(factory, "cache_info") else functools.lru_cache(maxsize=None)(factory)
+            for key, factory in (factories or {}).items()
+            if key not in self._values
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = self._factories[key]()
+            del self._factories[key]
+            return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._factories.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._factories:
+            del self._factories[key]
+        else:
+            del self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._values)
+        yield from list(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._factories)
+
+    def __repr__(self) -> str:
+        pending = ", ".join(sorted(self._factories))
+        return f"LazyContext({self._values!r}, pending=[{pending}])"
+
+    def copy(self) -> "LazyContext":
+        return LazyContext(self._values, self._factories)
+
+    __copy__ = copy
@@ -0,0 +1,217 @@
+"""Run a dependency graph of operators locally, starting each task as soon as its upstreams finish."""
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.batch import _entry_kwargs
+
+SUCCESS = "success"
+FAILED = "failed"
+UPSTREAM_FAILED = "upstream_failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class TaskNode:
+    task_id: str
+    build: Callable[[], Any]
+    upstream: Set[str] = field(default_factory=set)
+    trigger_rule: str = "all_success"
+
+
+def _spec_node(index: int, spec: Dict[str, Any]) -> TaskNode:
+    kwargs = _entry_kwargs(index, spec)
+    trigger_rule = spec.get("trigger_rule") or kwargs.get("trigger_rule") or "all_success"
+
+    def build():
+        from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+        return ExecuteAnyOperator(operator=spec["operator"], **kwargs)
+
+    return TaskNode(kwargs["task_id"], build, set(spec.get("upstream") or []), str(trigger_rule))
+
+
+def _task_node(task) -> TaskNode:
+    def build():
+        from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+        return ExecuteAnyOperator(operator=task)
+
+    return TaskNode(task.task_id, build, set(task.upstream_task_ids), str(task.trigger_rule))
+
+
+def load_spec_graph(path: str) -> List[TaskNode]:
+    """Load ``{"tasks": [{"task_id", "operator", "kwargs", "upstream", "trigger_rule"}, ...]}`` from JSON or YAML."""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to read the graph file {path}")
+            graph = yaml.safe_load(f)
+        else:
+            graph = json.load(f)
+    tasks = graph.get("tasks") if isinstance(graph, dict) else graph
+    if not isinstance(tasks, list):
+        raise ValueError(f"Graph file {path} must contain a list of tasks")
+    return [_spec_node(index, spec) for index, spec in enumerate(tasks)]
+
+
+def load_dag_file(path: str, dag_id: Optional[str] = None) -> List[TaskNode]:
+    """Load the tasks of an Airflow DAG defined in a Python file."""
+    ensure_airflow_patched()
+    from airflow.models.dag import DAG
+    from execute_any_operator.utils.mock import context_patches
+
+    module_name = f"execute_any_dag_{os.path.splitext(os.path.basename(path))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    with ExitStack() as stack:
+        for patch in context_patches:
+            stack.enter_context(patch)
+        spec.loader.exec_module(module)
+
+    dags = {dag.dag_id: dag for dag in vars(module).values() if isinstance(dag, DAG)}
+    if dag_id is not None:
+        if dag_id not in dags:
+            raise ValueError(f"DAG {dag_id} not found in {path}, found: {sorted(dags)}")
+        dag = dags[dag_id]
+    elif len(dags) == 1:
+        dag = next(iter(dags.values()))
+    else:
+        raise ValueError(f"{path} defines {len(dags)} DAGs, choose one with a DAG id: {sorted(dags)}")
+    return [_task_node(task) for task in dag.tasks]
+
+
+def load_graph(path: str, dag_id: Optional[str] = None) -> List[TaskNode]:
+    if path.endswith(".py"):
+        return load_dag_file(path, dag_id)
+    return load_spec_graph(path)
+
+
+def _validate(nodes: Dict[str, TaskNode]) -> None:
+    for node in nodes.values():
+        unknown = node.upstream - nodes.keys()
+        if unknown:
+            raise ValueError(f"Task {node.task_id} depends on unknown tasks: {sorted(unknown)}")
+    remaining = {task_id: set(node.upstream) for task_id, node in nodes.items()}
+    while remaining:
+        ready = [task_id for task_id, upstream in remaining.items() if not upstream]
+        if not ready:
+            raise ValueError(f"The graph has a cycle between: {sorted(remaining)}")
+        for task_id in ready:
+            del remaining[task_id]
+        for upstream in remaining.values():
+            upstream.difference_update(ready)
+
+
+# Rules that let a task run as soon as one upstream ends in one of these states, as in Airflow
+EAGER_TRIGGER_STATES = {"one_success": (SUCCESS,), "one_failed": (FAILED, UPSTREAM_FAILED)}
+
+
+def evaluate_trigger_rule(rule: str, upstream_states: List[str]) -> Optional[str]:
+    """Decide a task's fate once all its upstreams are done.
+
+    Returns ``None`` when the task should run, otherwise the state to give it without running.
+    """
+    total = len(upstream_states)
+    successes = upstream_states.count(SUCCESS)
+    failures = upstream_states.count(FAILED) + upstream_states.count(UPSTREAM_FAILED)
+    skips = upstream_states.count(SKIPPED)
+
+    if rule in ("always", "dummy", "all_done"):
+        return None
+    if rule == "all_success":
+        if failures:
+            return UPSTREAM_FAILED
+        return SKIPPED if skips else None
+    if rule == "all_failed":
+        return None if failures == total else SKIPPED
+    if rule == "one_success":
+        return None if successes or not total else UPSTREAM_FAILED
+    if rule == "one_failed":
+        return None if failures or not total else SKIPPED
+    if rule == "none_failed":
+        return UPSTREAM_FAILED if failures else None
+    if rule in ("none_failed_min_one_success", "none_failed_or_skipped"):
+        if failures:
+            return UPSTREAM_FAILED
+        return None if successes or not total else SKIPPED
+    if rule == "none_skipped":
+        return SKIPPED if skips else None
+    raise ValueError(f"Unsupported trigger rule: {rule}")
+
+
+def _run_node(node: TaskNode) -> Dict[str, Any]:
+    from airflow.exceptions import AirflowSkipException
+
+    record = {"task_id": node.task_id, "state": FAILED}
+    started = time.perf_counter()
+    try:
+        task = node.build()
+        record["return_value"] = task.execute()
+        record["state"] = SUCCESS
+    except AirflowSkipException:
+        record["state"] = SKIPPED
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def run_graph(nodes: List[TaskNode], workers: int = 4) -> Iterator[Dict[str, Any]]:
+    """Run the graph on a pool of ``workers`` threads, yielding a record as each task finishes.
+
+    A task is submitted as soon as all of its upstreams are done and its trigger rule
+    allows it to run, or, for ``one_success`` and ``one_failed``, as soon as one upstream
+    succeeds or fails. Tasks that will not run are recorded as ``skipped`` or
+    ``upstream_failed`` without being started. All tasks share the in-memory XCom store,
+    so downstream tasks can ``xcom_pull`` from their upstreams.
+    """
+    nodes = {node.task_id: node for node in nodes}
+    _validate(nodes)
+    ensure_airflow_patched()
+    states: Dict[str, str] = {}
+    downstream: Dict[str, Set[str]] = {task_id: set() for task_id in nodes}
+    for node in nodes.values():
+        for upstream_id in node.upstream:
+            downstream[upstream_id].add(node.task_id)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+
+        def schedule(candidates):
+            for task_id in sorted(candidates):
+                node = nodes[task_id]
+                if task_id in states or task_id in running.values():
+                    continue
+                upstream_states = [states[u] for u in node.upstream if u in states]
+                if len(upstream_states) < len(node.upstream):
+                    eager_states = EAGER_TRIGGER_STATES.get(node.trigger_rule, ())
+                    if not any(state in eager_states for state in upstream_states):
+                        continue
+                    verdict = None
+                else:
+                    verdict = evaluate_trigger_rule(node.trigger_rule, upstream_states)
+                if verdict is None:
+                    running[executor.submit(_run_node, node)] = task_id
+                else:
+                    states[task_id] = verdict
+                    yield {"task_id": task_id, "state": verdict, "duration": 0.0}
+                    yield from schedule(downstream[task_id])
+
+        yield from schedule(nodes)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_id = running.pop(future)
+                record = future.result()
+                states[task_id] = record["state"]
+                yield record
+                yield from schedule(downstream[task_id])
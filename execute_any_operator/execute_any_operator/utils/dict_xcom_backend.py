@@ -1,18 +1,102 @@
-from typing import Any, Iterable, Optional, Union
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 from airflow.models.xcom import BaseXCom
 from airflow.utils.helpers import is_container
 
-XComData = {}
+_MISSING = object()
+_lock = threading.RLock()
 
 
-def _update(d, u):
-    for k, v in u.items():
-        if isinstance(v, dict):
-            d[k] = _update(d.get(k, {}), v)
-        else:
-            d[k] = v
-    return d
+def _deserialize(value) -> Any:
+    # BaseXCom.deserialize_value expects a row with a `value` attribute, not the raw bytes
+    return BaseXCom.deserialize_value(SimpleNamespace(value=value))
+
+
+class XComStore:
+    """In-memory XComs indexed by ``(dag_id, task_id, key)``.
+
+    Serialized values are also kept in the nested ``data[dag_id][task_id][key]`` layout
+    that ``XComData`` has always exposed; treat that as a read-only view. Deserialized
+    values are cached on first read.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._index: Dict[Tuple[str, str, str], Any] = {}
+        self._values: Dict[Tuple[str, str, str], Any] = {}
+
+    def set(self, dag_id: str, task_id: str, key: str, serialized: Any) -> None:
+        ident = (dag_id, task_id, key)
+        self.data.setdefault(dag_id, {}).setdefault(task_id, {})[key] = serialized
+        self._index[ident] = serialized
+        self._values.pop(ident, None)
+
+    def get(self, ident: Tuple[str, str, str]) -> Any:
+        """The deserialized value for ``ident``, or ``_MISSING``."""
+        value = self._values.get(ident, _MISSING)
+        if value is _MISSING:
+            serialized = self._index.get(ident, _MISSING)
+            if serialized is _MISSING:
+                return _MISSING
+            value = self._values[ident] = _deserialize(serialized)
+        return value
+
+    def delete(self, dag_id: str, task_id: str, key: str) -> None:
+        ident = (dag_id, task_id, key)
+        self._index.pop(ident, None)
+        self._values.pop(ident, None)
+        self.data.get(dag_id, {}).get(task_id, {}).pop(key, None)
+
+    def clear(self, dag_id: str, task_id: str) -> None:
+        for key in list(self.data.get(dag_id, {}).pop(task_id, {})):
+            self._index.pop((dag_id, task_id, key), None)
+            self._values.pop((dag_id, task_id, key), None)
+
+    def task_values(self, dag_id: str, task_id: str) -> Dict[str, Any]:
+        return {key: self.get((dag_id, task_id, key)) for key in self.data.get(dag_id, {}).get(task_id, {})}
+
+    def merge(self, other: "XComStore") -> None:
+        for (dag_id, task_id, key), serialized in other._index.items():
+            self.set(dag_id, task_id, key, serialized)
+
+
+_global_store = XComStore()
+XComData = _global_store.data
+
+# Tasks running concurrently get their own store, merged back into XComData when they finish
+_xcom_store: ContextVar[Optional[XComStore]] = ContextVar("xcom_store", default=None)
+
+
+def _store() -> XComStore:
+    store = _xcom_store.get()
+    return _global_store if store is None else store
+
+
+@contextmanager
+def isolated_xcom() -> Iterator[XComStore]:
+    """Route XCom reads and writes of the current context to a fresh, private store."""
+    store = XComStore()
+    token = _xcom_store.set(store)
+    try:
+        yield store
+    finally:
+        _xcom_store.reset(token)
+
+
+def merge_xcom(store: XComStore) -> None:
+    """Merge an isolated store into the global ``XComData``."""
+    with _lock:
+        _global_store.merge(store)
+
+
+def task_xcoms(dag_id: str, task_id: str) -> Dict[str, Any]:
+    """Return every XCom pushed by a task as ``{key: deserialized_value}``."""
+    with _lock:
+        return _store().task_values(dag_id, task_id)
 
 
 class DictXComBackend(BaseXCom):
@@ -26,7 +110,21 @@ class DictXComBackend(BaseXCom):
         """
         value = BaseXCom.serialize_value(value)
 
-        _update(XComData, {dag_id: {task_id: {key: value}}})
+        with _lock:
+            _store().set(dag_id, task_id, key, value)
+
+    @classmethod
+    def set_many(cls, xcoms: Iterable[Tuple[str, Any, str, str]], **kwargs) -> None:
+        """
+        Store many XCom values, given as ``(key, value, task_id, dag_id)`` tuples.
+
+        :return: None
+        """
+        serialized = [(dag_id, task_id, key, BaseXCom.serialize_value(value)) for key, value, task_id, dag_id in xcoms]
+        with _lock:
+            store = _store()
+            for item in serialized:
+                store.set(*item)
 
     @classmethod
     def get_one(cls, key: Optional[str] = None, task_id: Optional[Union[str, Iterable[str]]] = None, dag_id: Optional[Union[str, Iterable[str]]] = None, **kwargs) -> Optional[Any]:
@@ -43,30 +141,22 @@ class DictXComBackend(BaseXCom):
         if not is_container(dag_ids):
             dag_ids = [dag_ids]
 
-        results = tuple()
-        for dag_id in dag_ids:
-            for task_id in task_ids:
-                try:
-                    value = XComData[dag_id][task_id][key]
-                    results = results + (BaseXCom.deserialize_value(value),)
-                except KeyError:
-                    pass
-        return results
+        with _lock:
+            store = _store()
+            values = [store.get((dag_id, task_id, key)) for dag_id in dag_ids for task_id in task_ids]
+        return tuple(value for value in values if value is not _MISSING)
 
     @classmethod
     def delete(cls, xcoms, **kwargs):
         if not is_container(xcoms):
             xcoms = [xcoms]
 
-        for xcom in xcoms:
-            try:
-                del XComData[xcom.dag_id][xcom.task_id][xcom.key]
-            except KeyError:
-                pass
+        with _lock:
+            store = _store()
+            for xcom in xcoms:
+                store.delete(xcom.dag_id, xcom.task_id, xcom.key)
 
     @classmethod
     def clear(cls, dag_id: str = None, task_id: str = None, **kwargs) -> None:
-        try:
-            del XComData[dag_id][task_id]
-        except KeyError:
-            pass
+        with _lock:
+            _store().clear(dag_id, task_id)
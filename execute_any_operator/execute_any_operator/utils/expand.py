@@ -0,0 +1,119 @@
+"""Map a callable over many argument sets on a process pool, like Airflow's ``.expand()``."""
+import json
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def read_arg_sets(arg_sets: IO[str]) -> Iterator[Any]:
+    """Yield the argument sets of a JSON list or of a JSON Lines file, one set per line.
+
+    A JSON Lines file is read lazily, so it can be larger than memory.
+    """
+    first = arg_sets.read(1)
+    while first.isspace():
+        first = arg_sets.read(1)
+    if first == "[":
+        yield from json.loads(first + arg_sets.read())
+        return
+    for line_no, line in enumerate(_prepend(first, arg_sets), start=1):
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Argument set on line {line_no} is not valid JSON: {e}")
+
+
+def _prepend(first: str, lines: IO[str]) -> Iterator[str]:
+    rest = next(lines, "")
+    yield first + rest
+    yield from lines
+
+
+def _call_args(arg_set: Any, op_args: Sequence[Any], op_kwargs: Dict[str, Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Combine an argument set with the fixed arguments: objects are keyword arguments, lists positional ones."""
+    if isinstance(arg_set, dict):
+        return list(op_args), {**op_kwargs, **arg_set}
+    if isinstance(arg_set, list):
+        return [*op_args, *arg_set], dict(op_kwargs)
+    return [*op_args, arg_set], dict(op_kwargs)
+
+
+def _run_chunk(
+    python_callable: Callable, op_args: Sequence[Any], op_kwargs: Dict[str, Any], chunk: List[Tuple[int, Any]]
+) -> List[Dict[str, Any]]:
+    records = []
+    for index, arg_set in chunk:
+        record = {"index": index, "state": "failed"}
+        started = time.perf_counter()
+        try:
+            args, kwargs = _call_args(arg_set, op_args, op_kwargs)
+            # Pickled here so that a return value that can't be sent back fails only its own call
+            record["return_value"] = pickle.dumps(python_callable(*args, **kwargs))
+            record["state"] = "success"
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["duration"] = round(time.perf_counter() - started, 6)
+        records.append(record)
+    return records
+
+
+def _unpickled(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for record in records:
+        if "return_value" in record:
+            record["return_value"] = pickle.loads(record["return_value"])
+    return records
+
+
+def _failed_chunk(chunk: List[Tuple[int, Any]], error: BaseException) -> List[Dict[str, Any]]:
+    """Records for every call of a chunk whose worker failed, e.g. because it was killed."""
+    return [{"index": index, "state": "failed", "error": f"{type(error).__name__}: {error}"} for index, _ in chunk]
+
+
+def expand(
+    python_callable: Callable,
+    arg_sets: Iterable[Any],
+    op_args: Sequence[Any] = (),
+    op_kwargs: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> Iterator[Dict[str, Any]]:
+    """Call ``python_callable`` once per argument set on ``workers`` processes, yielding records in input order.
+
+    Argument sets are sent to the workers in chunks of ``chunk_size``, and at most
+    ``workers * 2`` chunks are in flight, so neither the input nor the results are held in
+    memory as a whole. A failing call, including one whose return value can't be pickled,
+    is recorded with its error and does not stop the others. When a worker process dies,
+    the calls of its chunk are recorded as failed.
+    """
+    op_kwargs = op_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+    numbered = enumerate(arg_sets)
+
+    def results(chunk: List[Tuple[int, Any]], future) -> List[Dict[str, Any]]:
+        try:
+            return _unpickled(future.result())
+        except Exception as e:
+            return _failed_chunk(chunk, e)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in iter(lambda: list(islice(numbered, chunk_size)), []):
+            try:
+                future = executor.submit(_run_chunk, python_callable, op_args, op_kwargs, chunk)
+            except BrokenProcessPool as e:
+                yield from _failed_chunk(chunk, e)
+                continue
+            in_flight.append((chunk, future))
+            if len(in_flight) >= workers * 2:
+                yield from results(*in_flight.popleft())
+        while in_flight:
+            yield from results(*in_flight.popleft())
@@ -0,0 +1,162 @@
+"""A pre-warmed daemon that forks a fresh child per job received on a Unix socket.
+
+The wire protocol is newline delimited JSON. A client sends one request, which has the
+same shape as a ``run-batch`` manifest entry, and then reads frames until the result:
+
+    {"type": "log", "line": "..."}
+    {"type": "result", "exit_code": 0, "record": {...}}
+"""
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import threading
+from typing import IO, Any, Dict, Iterable
+
+from execute_any_operator.operators import ensure_airflow_patched
+
+DEFAULT_SOCKET = "/tmp/execute-any-operator.sock"
+
+# Seconds to wait for the job's output to drain once it has finished
+OUTPUT_DRAIN_TIMEOUT = 5
+
+
+def _frame(frame: Dict[str, Any]) -> bytes:
+    return (json.dumps(frame, default=str) + "\n").encode()
+
+
+def _send(conn: socket.socket, frame: Dict[str, Any]) -> None:
+    conn.sendall(_frame(frame))
+
+
+def _forward_output(read_fd: int, conn: socket.socket, lock: threading.Lock, stopped: threading.Event) -> None:
+    with os.fdopen(read_fd, "r", errors="replace") as pipe:
+        for line in pipe:
+            with lock:
+                if stopped.is_set():
+                    return
+                conn.sendall(_frame({"type": "log", "line": line.rstrip("\n")}))
+
+
+def _run_job(conn: socket.socket) -> int:
+    from execute_any_operator.utils.batch import run_entry
+    from execute_any_operator.utils.isolation import isolated_env
+    from execute_any_operator.utils.logs import flush_logs
+
+    with conn.makefile("r") as reader:
+        request = json.loads(reader.readline())
+
+    # Send everything the task writes to stdout/stderr (including subprocesses) back to the client
+    read_fd, write_fd = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+    send_lock, stopped = threading.Lock(), threading.Event()
+    forwarder = threading.Thread(target=_forward_output, args=(read_fd, conn, send_lock, stopped), daemon=True)
+    forwarder.start()
+    try:
+        with isolated_env(request.get("env"), apply_to_process=True):
+            record = run_entry(0, request)
+    finally:
+        flush_logs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        # A background process started by the job can keep the pipe open after the job is done
+        forwarder.join(OUTPUT_DRAIN_TIMEOUT)
+        with send_lock:
+            stopped.set()
+        if forwarder.is_alive():
+            line = f"Output is still open {OUTPUT_DRAIN_TIMEOUT}s after the job finished, not forwarding the rest"
+            _send(conn, {"type": "log", "line": line})
+
+    exit_code = 0 if record["state"] == "success" else 1
+    _send(conn, {"type": "result", "exit_code": exit_code, "record": record})
+    return exit_code
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a daemon that is gone, refusing to touch anything else."""
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+    raise FileExistsError(f"Another daemon is already serving on {socket_path}")
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, preload: Iterable[str] = ()) -> None:
+    """Import Airflow and the ``preload`` operators once, then fork a child per connection."""
+    # Checked before paying for the imports, and again right before binding
+    _remove_stale_socket(socket_path)
+    ensure_airflow_patched()
+    from execute_any_operator.operators.registry import registry
+
+    registry.preload(preload)
+    registry.dag()
+
+    _remove_stale_socket(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    bound_inode = os.stat(socket_path).st_ino
+
+    # Let the kernel reap finished children; they report back over their socket, not their status
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            conn, _ = server.accept()
+            if os.fork() == 0:
+                server.close()
+                # Operators that spawn subprocesses need to be able to wait on them
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                exit_code = 1
+                try:
+                    exit_code = _run_job(conn)
+                finally:
+                    conn.close()
+                    os._exit(exit_code)
+            conn.close()
+    finally:
+        server.close()
+        # Only remove the socket if it is still this daemon's
+        try:
+            if os.stat(socket_path).st_ino == bound_inode:
+                os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def submit(request: Dict[str, Any], socket_path: str = DEFAULT_SOCKET, log_stream: IO[str] = sys.stderr) -> Dict[str, Any]:
+    """Send a job to a running daemon, writing its log lines to ``log_stream``.
+
+    Returns the final result frame, with ``exit_code`` and the run-batch style ``record``.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        _send(conn, request)
+        conn.shutdown(socket.SHUT_WR)
+        with conn.makefile("r") as reader:
+            for line in reader:
+                frame = json.loads(line)
+                if frame["type"] == "log":
+                    log_stream.write(frame["line"] + "\n")
+                    log_stream.flush()
+                elif frame["type"] == "result":
+                    return frame
+    raise ConnectionError("Daemon closed the connection without sending a result")
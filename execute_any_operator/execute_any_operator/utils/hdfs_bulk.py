@@ -0,0 +1,165 @@
+"""Check many HDFS paths over one pyarrow filesystem connection, with a single listing per directory."""
+import getpass
+import os
+import posixpath
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from execute_any_operator.utils.sensors import next_poke_interval, poke_schedule
+
+ARROW_HDFS_SENSOR = "arrow_hdfs_sensor.sensor:ArrowHdfsSensor"
+DEFAULT_IGNORED_EXT = ["_COPYING_"]
+MEGABYTE = 1024 * 1024
+
+
+def connect(hdfs_conn_id: str) -> Tuple[Any, str]:
+    """A pyarrow filesystem for an Airflow connection, and the directory relative paths resolve against.
+
+    ``file`` connections use the local filesystem and the working directory. Any other type
+    connects through the hook of ``ArrowHdfsSensor``, exactly as the single-path sensor does on
+    each poke, and resolves relative paths under the user's home directory.
+    """
+    from airflow.models.connection import Connection
+    from pyarrow import fs
+
+    conn = Connection.get_connection_from_secrets(hdfs_conn_id)
+    if conn.conn_type in ("file", "local"):
+        return fs.LocalFileSystem(), os.getcwd()
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+    sensor = ExecuteAnyOperator(operator=ARROW_HDFS_SENSOR, filepath="/", hdfs_conn_id=hdfs_conn_id).task
+    filesystem = sensor.hook(sensor.hdfs_conn_id).get_conn()
+    # libhdfs connects as the current user when the connection has no login
+    return filesystem, f"/user/{conn.login or getpass.getuser()}"
+
+
+def normalize_path(path: str, working_dir: Optional[str] = None) -> str:
+    """The absolute path of ``path``, which may also be an hdfs:// url.
+
+    Relative paths resolve against ``working_dir``, and are rejected without one.
+    """
+    parsed = urlparse(path)
+    if parsed.scheme:
+        return posixpath.normpath("/" + parsed.path.lstrip("/"))
+    if not path.startswith("/"):
+        if not working_dir:
+            raise ValueError(f"Path {path} is relative, give an absolute path or an hdfs:// url")
+        path = posixpath.join(working_dir, path)
+    return posixpath.normpath(path)
+
+
+def filter_files(
+    files: Iterable[Tuple[str, int]],
+    file_size: Optional[float] = None,
+    ignored_ext: Sequence[str] = DEFAULT_IGNORED_EXT,
+    ignore_copying: bool = True,
+) -> List[Tuple[str, int]]:
+    """Apply ``HdfsSensor``'s filters to ``(path, size)`` pairs: a minimum size in MB and ignored extensions."""
+    files = list(files)
+    if file_size:
+        files = [(path, size) for path, size in files if size >= file_size * MEGABYTE]
+    if ignore_copying and ignored_ext:
+        ignored = re.compile(r"^.*\.(%s$)$" % "$|".join(ignored_ext))
+        files = [(path, size) for path, size in files if not ignored.match(path)]
+    return files
+
+
+class DirectoryListing:
+    """Lists directories on a pyarrow filesystem, counting the listings made."""
+
+    def __init__(self, filesystem):
+        self.filesystem = filesystem
+        self.listings = 0
+
+    def list(self, directory: str) -> Dict[str, Any]:
+        from pyarrow.fs import FileSelector
+
+        self.listings += 1
+        infos = self.filesystem.get_file_info(FileSelector(directory, allow_not_found=True))
+        return {normalize_path(info.path): info for info in infos}
+
+
+def check_paths(
+    filesystem,
+    paths: Iterable[str],
+    file_size: Optional[float] = None,
+    ignored_ext: Sequence[str] = DEFAULT_IGNORED_EXT,
+    ignore_copying: bool = True,
+    poke_interval: float = 60,
+    timeout: float = 60 * 60 * 24 * 7,
+    exponential_backoff: bool = False,
+    working_dir: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Poke until every path has files that pass the filters, or ``timeout`` passes.
+
+    Relative paths are relative to ``working_dir``, e.g. the one returned by ``connect``.
+    Paths resolve against a listing of their parent directory, and a path that is a
+    directory against a listing of its own contents, like ``HdfsSensor``. Each directory is
+    listed at most once per poke, and found paths are not checked again. Returns one status
+    record per path plus a summary with the number of listings made.
+    """
+    from pyarrow.fs import FileType
+
+    statuses = {}
+    groups = defaultdict(list)
+    for path in dict.fromkeys(paths):
+        normalized = normalize_path(path, working_dir)
+        statuses[path] = {"path": path, "normalized": normalized, "exists": False, "found": False}
+        groups[posixpath.dirname(normalized)].append(path)
+
+    listing = DirectoryListing(filesystem)
+    schedule = poke_schedule("hdfs_bulk_check", poke_interval, timeout, exponential_backoff)
+    started, started_at, pokes = time.monotonic(), time.time(), 0
+    while True:
+        pokes += 1
+        listings = {}
+
+        def list_directory(directory: str) -> Dict[str, Any]:
+            if directory not in listings:
+                listings[directory] = listing.list(directory)
+            return listings[directory]
+
+        for directory, group_paths in groups.items():
+            pending = [path for path in group_paths if not statuses[path]["found"]]
+            if not pending:
+                continue
+            entries = list_directory(directory)
+            for path in pending:
+                status = statuses[path]
+                info = entries.get(status["normalized"])
+                if info is None:
+                    status["exists"] = False
+                    continue
+                if info.type == FileType.Directory:
+                    children = list_directory(status["normalized"])
+                    files = [(child, child_info.size or 0) for child, child_info in children.items()]
+                else:
+                    files = [(status["normalized"], info.size or 0)]
+                matched = filter_files(files, file_size, ignored_ext, ignore_copying)
+                status.update(
+                    exists=True,
+                    found=bool(matched),
+                    files=len(matched),
+                    size=sum(size for _, size in matched),
+                )
+
+        missing = sum(not status["found"] for status in statuses.values())
+        elapsed = time.monotonic() - started
+        if not missing or elapsed > timeout:
+            break
+        time.sleep(next_poke_interval(schedule, started_at, pokes, elapsed))
+
+    summary = {
+        "paths": len(statuses),
+        "found": len(statuses) - missing,
+        "missing": missing,
+        "pokes": pokes,
+        "listings": listing.listings,
+        "duration": round(time.monotonic() - started, 6),
+    }
+    for status in statuses.values():
+        del status["normalized"]
+    return list(statuses.values()), summary
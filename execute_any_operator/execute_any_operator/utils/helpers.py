@@ -1,5 +1,12 @@
 import importlib
-from typing import Any, Callable, Dict, List, Tuple
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.result_cache import result_cache
+from execute_any_operator.utils.sensors import RESCHEDULE_EXIT_CODE, poke_rescheduled
 
 
 def _multi_tuple_to_dict(ctx, param, value: List[Tuple[str, Any]]) -> Dict[str, Any]:
@@ -20,3 +27,88 @@ def _str_to_callable(ctx, param, value: str) -> Callable:
         if not isinstance(func, Callable):
             raise TypeError(f"Provided attribute must be callable: {value}")
         return func
+
+
+def _sensor_mode_options(func):
+    func = click.option(
+        "--state-file",
+        default=None,
+        type=click.Path(dir_okay=False),
+        help="File the sensor's progress is kept in between invocations in reschedule mode.",
+    )(func)
+    func = click.option(
+        "--mode",
+        default="poke",
+        type=click.Choice(["poke", "reschedule"]),
+        show_default=True,
+        help=f"""In poke mode the sensor sleeps between pokes until it succeeds or times out.
+In reschedule mode it pokes once and, if it is not satisfied yet, saves its progress to
+--state-file and exits with code {RESCHEDULE_EXIT_CODE}, to be invoked again later.""",
+    )(func)
+    return func
+
+
+def _execute_sensor(task, mode: str, state_file: Optional[str]) -> None:
+    """Execute a sensor task in ``mode``, exiting with ``RESCHEDULE_EXIT_CODE`` when a rescheduled poke is not satisfied."""
+    if mode == "poke":
+        task.execute()
+        return
+    if state_file is None:
+        raise click.UsageError("--state-file is required in reschedule mode")
+    from airflow.models.taskinstance import XCOM_RETURN_KEY
+
+    done, xcom_value, state = poke_rescheduled(task, state_file)
+    if not done:
+        click.echo(
+            f"Not satisfied after {state['try_number']} pokes, next poke in {state['next_poke_at'] - time.time():.0f}s"
+        )
+        sys.exit(RESCHEDULE_EXIT_CODE)
+    if task.task.do_xcom_push and xcom_value is not None:
+        task.task.xcom_push(task.context, key=XCOM_RETURN_KEY, value=xcom_value)
+
+
+def _replay_xcom(dag_id: str, task_id: str, xcom: Dict[str, Any]) -> None:
+    """Write the XComs of a cached result to the configured XCom backend."""
+    if not xcom:
+        return
+    ensure_airflow_patched()
+    from airflow.models.xcom import XCom
+
+    values = [(key, value, task_id, dag_id) for key, value in xcom.items()]
+    if hasattr(XCom, "set_many"):
+        XCom.set_many(values)
+    else:
+        for key, value, task_id, dag_id in values:
+            XCom.set(key=key, value=value, task_id=task_id, dag_id=dag_id)
+
+
+def _execute_cached(operator: str, **kwargs) -> Dict[str, Any]:
+    """Execute ``operator`` with ``kwargs``, or replay its result when the result cache has it.
+
+    Returns ``{"return_value", "xcom", "dag_id", "task_id", "cached"}``. On a cache hit the
+    stored XComs are written to the XCom backend, as the operator did, and Airflow is only
+    imported when there are any.
+    """
+    cache = result_cache()
+    key = cache.key(operator, kwargs) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        _replay_xcom(cached.get("dag_id"), cached.get("task_id"), cached["xcom"])
+        return {
+            "return_value": cached["return_value"],
+            "xcom": cached["xcom"],
+            "dag_id": cached.get("dag_id"),
+            "task_id": cached.get("task_id"),
+            "cached": True,
+        }
+
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+    from execute_any_operator.utils.dict_xcom_backend import task_xcoms
+
+    task = ExecuteAnyOperator(operator=operator, **kwargs)
+    return_value = task.execute()
+    dag_id, task_id = task.task.dag_id, task.task_id
+    xcom = task_xcoms(dag_id, task_id)
+    if cache is not None:
+        cache.put(key, return_value, xcom, dag_id=dag_id, task_id=task_id)
+    return {"return_value": return_value, "xcom": xcom, "dag_id": dag_id, "task_id": task_id, "cached": False}
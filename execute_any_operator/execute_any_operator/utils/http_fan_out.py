@@ -0,0 +1,152 @@
+"""Send many HTTP requests concurrently over one pooled set of keep-alive connections per connection id."""
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from execute_any_operator.operators import ensure_airflow_patched
+
+
+def read_request_specs(specs: IO[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(index, spec)`` for every non-blank line of a JSON Lines file of request specs.
+
+    Each spec looks like ``{"endpoint": "api/items/1", "method": "GET", "data": {...}, "headers": {...}}``.
+    Every key is optional and falls back to the command's options.
+    """
+    index = 0
+    for line_no, line in enumerate(specs, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            spec = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Request line {line_no} is not valid JSON: {e}")
+        if not isinstance(spec, dict):
+            raise ValueError(f"Request line {line_no} must be an object")
+        yield index, spec
+        index += 1
+
+
+class SessionPool:
+    """One ``HttpHook`` and connection pool of ``pool_size`` per ``http_conn_id``, shared by every thread.
+
+    ``HttpHook.run`` builds a new session for every request. Here each worker thread builds one
+    ``requests`` session per connection, since sessions are not thread-safe, and mounts the
+    connection's shared ``HTTPAdapter`` on it, so every request reuses the pooled keep-alive
+    connections.
+    """
+
+    def __init__(self, pool_size: int, headers: Optional[Dict[str, str]] = None):
+        self.pool_size = pool_size
+        self.headers = headers or {}
+        self._hooks: Dict[str, Tuple[Any, Any]] = {}
+        self._sessions: List[Any] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _hook(self, http_conn_id: str) -> Tuple[Any, Any]:
+        with self._lock:
+            if http_conn_id not in self._hooks:
+                from airflow.providers.http.hooks.http import HttpHook
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                self._hooks[http_conn_id] = (HttpHook(http_conn_id=http_conn_id), adapter)
+            return self._hooks[http_conn_id]
+
+    def get(self, http_conn_id: str):
+        """Return ``(hook, session)`` for ``http_conn_id``, with a session owned by the calling thread."""
+        sessions = self._local.__dict__.setdefault("sessions", {})
+        hook, adapter = self._hook(http_conn_id)
+        if http_conn_id not in sessions:
+            session = hook.get_conn(self.headers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            with self._lock:
+                self._sessions.append(session)
+            sessions[http_conn_id] = session
+        return hook, sessions[http_conn_id]
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.close()
+        self._sessions.clear()
+        self._hooks.clear()
+
+
+def _url(base_url: Optional[str], endpoint: Optional[str]) -> str:
+    # The same joining rules as HttpHook.run
+    if base_url and not base_url.endswith("/") and endpoint and not endpoint.startswith("/"):
+        return f"{base_url}/{endpoint}"
+    return (base_url or "") + (endpoint or "")
+
+
+def send_request(
+    pool: SessionPool,
+    index: int,
+    spec: Dict[str, Any],
+    defaults: Dict[str, Any],
+    response_check: Optional[Callable] = None,
+    response_filter: Optional[Callable] = None,
+) -> Dict[str, Any]:
+    """Send one request and return its result record. Failures are recorded, not raised."""
+    import requests
+
+    spec = {**defaults, **{k: v for k, v in spec.items() if v is not None}}
+    method = spec.get("method", "POST").upper()
+    record = {"index": index, "method": method, "endpoint": spec.get("endpoint"), "state": "failed"}
+    started = time.perf_counter()
+    try:
+        hook, session = pool.get(spec.get("http_conn_id", "http_default"))
+        url = _url(hook.base_url, spec.get("endpoint"))
+        data, headers = spec.get("data"), spec.get("headers")
+        if method == "GET":
+            request = requests.Request(method, url, params=data, headers=headers)
+        elif method == "HEAD":
+            request = requests.Request(method, url, headers=headers)
+        else:
+            request = requests.Request(method, url, data=data, headers=headers)
+        response = hook.run_and_check(session, session.prepare_request(request), spec.get("extra_options") or {})
+        record["status_code"] = response.status_code
+        if response_check is not None and not response_check(response):
+            raise ValueError("Response check returned False.")
+        record["response"] = response_filter(response) if response_filter is not None else response.text
+        record["state"] = "success"
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def fan_out(
+    specs: Iterable[Tuple[int, Dict[str, Any]]],
+    concurrency: int,
+    defaults: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    response_check: Optional[Callable] = None,
+    response_filter: Optional[Callable] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Send every request with at most ``concurrency`` in flight, yielding records as responses arrive.
+
+    ``defaults`` fill in keys missing from a spec and ``headers`` are sent with every request.
+    Specs are read as requests complete, so large spec files are never fully materialized.
+    """
+    ensure_airflow_patched()
+    pool = SessionPool(concurrency, headers)
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for index, spec in specs:
+                if len(pending) >= concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(send_request, pool, index, spec, defaults, response_check, response_filter))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        pool.close()
@@ -0,0 +1,87 @@
+"""Per-task environment overlays so concurrently running tasks don't see each other's env vars."""
+import os
+from collections import ChainMap
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Iterator, Mapping, Optional
+
+_task_env: ContextVar[Optional[Dict[str, str]]] = ContextVar("task_env", default=None)
+_generation = 0
+_cli_env_keys: FrozenSet[str] = frozenset()
+
+
+def environ_changed() -> None:
+    """Signal that ``os.environ`` was modified, invalidating caches derived from it."""
+    global _generation
+    _generation += 1
+
+
+def set_cli_env(env: Mapping[str, str]) -> None:
+    """Set the ``--env-var`` variables in ``os.environ``, remembering which keys were given."""
+    global _cli_env_keys
+    os.environ.update(env)
+    _cli_env_keys = _cli_env_keys.union(env)
+    environ_changed()
+
+
+def cli_env_keys() -> FrozenSet[str]:
+    """The keys set with ``--env-var``."""
+    return _cli_env_keys
+
+
+def environ_version() -> int:
+    """A cheap token that changes whenever this package writes to ``os.environ``.
+
+    Code that writes to ``os.environ`` itself must call ``environ_changed``.
+    """
+    return _generation
+
+
+def task_overlay() -> Optional[Dict[str, str]]:
+    """The current task's env overlay, if any."""
+    return _task_env.get()
+
+
+def getenv(key: str, default: Optional[str] = None) -> Optional[str]:
+    """Like ``os.getenv`` but the current task's overlay takes precedence."""
+    overlay = _task_env.get()
+    if overlay is not None and key in overlay:
+        return overlay[key]
+    return os.environ.get(key, default)
+
+
+def environ() -> Mapping[str, str]:
+    """The process environment as seen by the current task."""
+    overlay = _task_env.get()
+    if overlay is None:
+        return os.environ
+    return ChainMap(overlay, os.environ)
+
+
+@contextmanager
+def isolated_env(env: Optional[Dict[str, str]] = None, apply_to_process: bool = False) -> Iterator[None]:
+    """Run a block with ``env`` layered over the process environment.
+
+    The overlay is only visible to code that reads through this module (Variable and
+    Connection lookups), which is what makes it safe to use from many threads at once.
+    With ``apply_to_process`` the variables are also written to ``os.environ`` and
+    restored afterwards, for single-task processes where libraries read the environment
+    directly.
+    """
+    env = {k.upper(): str(v) for k, v in (env or {}).items()}
+    token = _task_env.set(env)
+    previous = {k: os.environ.get(k) for k in env} if apply_to_process else {}
+    if apply_to_process:
+        os.environ.update(env)
+        environ_changed()
+    try:
+        yield
+    finally:
+        for k, v in previous.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        if apply_to_process:
+            environ_changed()
+        _task_env.reset(token)
@@ -0,0 +1,151 @@
+"""Run many shards of one ``KubernetesPodOperator`` pod template through a single Kubernetes client."""
+import copy
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import IO, Any, Dict, Iterator, List, Sequence
+
+
+def read_shard_args(shard_args: IO[str]) -> List[List[str]]:
+    """Read the arguments of each shard from a JSON list of shards or a JSON Lines file, one shard per line.
+
+    Each shard's arguments are a list of strings, or a single string for one argument. A
+    file holding a single JSON document is read as a list of shards.
+    """
+    content = shard_args.read()
+    try:
+        shards = json.loads(content)
+    except json.JSONDecodeError:
+        shards = [json.loads(line) for line in content.splitlines() if line.strip()]
+    if not isinstance(shards, list):
+        raise ValueError("Shard arguments must be a JSON list or JSON Lines")
+    return [[str(arg) for arg in args] if isinstance(args, list) else [str(args)] for args in shards]
+
+
+class PodFanOut:
+    """Launches a pod per shard from ``operator``'s pod template and follows them concurrently.
+
+    All shards share the operator's Kubernetes client and ``PodManager``. At most
+    ``concurrency`` pods exist at a time. Their logs are streamed to ``log_stream`` with a
+    ``[shard name]`` prefix, and every pod that was created is deleted if the run is
+    interrupted, regardless of ``is_delete_operator_pod``.
+    """
+
+    def __init__(self, operator, context: Dict[str, Any], concurrency: int, log_stream: IO[str] = sys.stdout):
+        self.operator = operator
+        self.context = context
+        self.concurrency = concurrency
+        self.log_stream = log_stream
+        # Each shard holds a log stream and makes API calls at the same time
+        self._use_pool_size(concurrency * 2)
+        self.pod_manager = operator.pod_manager
+        self._pods: Dict[str, Any] = {}
+        self._interrupted = threading.Event()
+        self._log_lock = threading.Lock()
+
+    def _use_pool_size(self, maxsize: int) -> None:
+        """Give the operator a client built from a copy of its configuration with ``maxsize`` pooled connections."""
+        from airflow.providers.cncf.kubernetes.utils.pod_manager import PodManager
+        from kubernetes import client as k8s_client
+
+        configuration = copy.deepcopy(self.operator.client.api_client.configuration)
+        configuration.connection_pool_maxsize = maxsize
+        core_v1 = k8s_client.CoreV1Api(k8s_client.ApiClient(configuration))
+        # Both are cached properties of the operator, so these replace the ones it built
+        self.operator.client = core_v1
+        self.operator.pod_manager = PodManager(kube_client=core_v1)
+
+    def build_pods(self, shard_args: Sequence[List[str]]) -> List[Any]:
+        """Build a pod request per shard, with the shard's arguments and its index in ``SHARD_INDEX``."""
+        from kubernetes.client import models as k8s
+
+        pods = []
+        template_arguments = self.operator.arguments
+        try:
+            for shard, args in enumerate(shard_args):
+                # build_pod_request_obj reads the operator's attributes, so shards are built one at a time
+                self.operator.arguments = args
+                pod = self.operator.build_pod_request_obj(self.context)
+                pod.metadata.labels["shard"] = str(shard)
+                container = next(c for c in pod.spec.containers if c.name == self.operator.BASE_CONTAINER_NAME)
+                container.env = list(container.env or []) + [
+                    k8s.V1EnvVar(name="SHARD_INDEX", value=str(shard)),
+                    k8s.V1EnvVar(name="SHARD_COUNT", value=str(len(shard_args))),
+                ]
+                pods.append(pod)
+        finally:
+            self.operator.arguments = template_arguments
+        return pods
+
+    def _stream_logs(self, shard: int, pod) -> None:
+        prefix = f"[{shard} {pod.metadata.name}] "
+        container = self.operator.BASE_CONTAINER_NAME
+        for line in self.pod_manager.read_pod_logs(pod, container, follow=True):
+            text = line.decode("utf-8", errors="replace").rstrip("\n")
+            with self._log_lock:
+                self.log_stream.write(prefix + text + "\n")
+                self.log_stream.flush()
+
+    def _delete(self, pod) -> None:
+        try:
+            self.pod_manager.delete_pod(pod)
+        except Exception:
+            self.operator.log.exception("Failed to delete pod %s", pod.metadata.name)
+        self._pods.pop(pod.metadata.name, None)
+
+    def _run_shard(self, shard: int, pod) -> Dict[str, Any]:
+        from airflow.providers.cncf.kubernetes.utils.pod_manager import PodPhase, get_container_termination_message
+
+        record = {"shard": shard, "pod_name": pod.metadata.name, "state": "failed"}
+        started = time.perf_counter()
+        try:
+            # Registered before it is created and checked after, so an interrupt can't leak the pod
+            self._pods[pod.metadata.name] = pod
+            self.pod_manager.create_pod(pod)
+            if self._interrupted.is_set():
+                raise RuntimeError("Interrupted")
+            self.operator.await_pod_start(pod)
+            if self.operator.get_logs:
+                self._stream_logs(shard, pod)
+            self.pod_manager.await_container_completion(pod, self.operator.BASE_CONTAINER_NAME)
+            if self.operator.do_xcom_push:
+                record["return_value"] = json.loads(self.pod_manager.extract_xcom(pod))
+            remote_pod = self.pod_manager.await_pod_completion(pod)
+            if remote_pod.status.phase == PodPhase.SUCCEEDED:
+                record["state"] = "success"
+            else:
+                message = get_container_termination_message(remote_pod, self.operator.BASE_CONTAINER_NAME)
+                record["error"] = f"Pod {pod.metadata.name} returned a failure: {message or remote_pod.status.phase}"
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            if self.operator.is_delete_operator_pod or self._interrupted.is_set():
+                self._delete(pod)
+            else:
+                self._pods.pop(pod.metadata.name, None)
+        record["duration"] = round(time.perf_counter() - started, 6)
+        return record
+
+    def run(self, shard_args: Sequence[List[str]]) -> Iterator[Dict[str, Any]]:
+        """Run every shard, yielding a record as each pod finishes."""
+        pods = self.build_pods(shard_args)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        pending = {executor.submit(self._run_shard, shard, pod) for shard, pod in enumerate(pods)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        except BaseException:
+            # Interrupted: stop shards that haven't started, delete the pods of those that have,
+            # which also ends their log streams
+            self._interrupted.set()
+            for future in pending:
+                future.cancel()
+            for pod in list(self._pods.values()):
+                self._delete(pod)
+            raise
+        finally:
+            executor.shutdown(wait=True)
@@ -0,0 +1,181 @@
+"""A queued logging pipeline, so that operators only pay for putting a record on a queue.
+
+Records are put on an in-memory queue by a ``QueueHandler`` on the root logger and
+formatted and written by a ``QueueListener`` thread, with the handlers the root logger had
+(Airflow's console handler) and, optionally, a file per task. Each record is tagged with
+the task_id and phase of the metrics span it was logged in.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.util import Finalize
+from typing import IO, Dict, List, Optional
+from urllib.parse import quote
+
+from execute_any_operator.utils.metrics import current_span
+
+LOG_FORMAT_ENV = "EXECUTE_ANY_OPERATOR_LOG_FORMAT"
+LOG_DIR_ENV = "EXECUTE_ANY_OPERATOR_LOG_DIR"
+
+# Records logged outside of a task go to this file in the log directory
+PROCESS_LOG_NAME = "execute_any_operator"
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+def task_log_name(task_id: Optional[str]) -> str:
+    """A file name for ``task_id``'s records that no other task id maps to."""
+    if task_id is None:
+        return PROCESS_LOG_NAME
+    # quote is reversible and never outputs "%5F", as it leaves "_" as it is
+    name = quote(task_id, safe="")
+    return name.replace("_", "%5F") if name == PROCESS_LOG_NAME else name
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats a record as one JSON object with its time, level, logger, task_id, phase and message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "task_id": getattr(record, "task_id", None),
+            "phase": getattr(record, "phase", None),
+            "message": record.getMessage(),
+        }
+        exc_text = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+        if exc_text:
+            entry["exc_info"] = exc_text
+        return json.dumps(entry, default=str)
+
+
+class SpanQueueHandler(QueueHandler):
+    """Tags records with the current span and queues them with their message merged."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is merged with its args now, as they may change before the listener
+        # writes the record. Unlike the default prepare, the record isn't formatted here, so
+        # each listener handler still applies its own format.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        record.phase, record.task_id = current_span.get()
+        return record
+
+
+class TaskFileHandler(logging.Handler):
+    """Writes each record to ``<directory>/<task_id>.log``, keeping the files open.
+
+    Task ids are percent-encoded, so e.g. ``t/1`` and ``t_1`` get different files.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self._files: Dict[str, IO[str]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _file(self, task_id: Optional[str]) -> IO[str]:
+        name = task_log_name(task_id)
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self.directory, f"{name}.log"), "a")
+        return self._files[name]
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            f = self._file(getattr(record, "task_id", None))
+            f.write(self.format(record) + "\n")
+            f.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        with self.lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+        super().close()
+
+
+class LogPipeline:
+    """Moves the root logger's handlers behind a queue drained by a listener thread."""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        self.handlers = handlers
+        self.handler = SpanQueueHandler(queue.SimpleQueue())
+        self.listener = self._listener()
+
+    def _listener(self) -> QueueListener:
+        return QueueListener(self.handler.queue, *self.handlers, respect_handler_level=True)
+
+    def start(self) -> None:
+        self.listener.start()
+        atexit.register(self.stop)
+        # A forked child has no listener thread, so it gets its own queue and listener
+        os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _restart_in_child(self) -> None:
+        self.handler.queue = queue.SimpleQueue()
+        self.listener = self._listener()
+        self.listener.start()
+        # Pool workers exit without running atexit hooks, but do run multiprocessing's finalizers
+        Finalize(self, self.stop, exitpriority=0)
+
+    def flush(self) -> None:
+        """Write out every record queued so far, keeping the pipeline running."""
+        self.listener.stop()
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write out every queued record and stop the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def flush_logs() -> None:
+    """Write out every queued record, e.g. before a forked child exits with ``os._exit``."""
+    if _pipeline is not None:
+        _pipeline.flush()
+
+
+def configure_logging(log_format: Optional[str] = None, log_dir: Optional[str] = None) -> Optional[LogPipeline]:
+    """Queue the root logger's records, with ``--log-format`` and ``--log-dir`` (or their environment variables).
+
+    Does nothing unless either is set. Must be called after Airflow has configured logging,
+    which replaces the root logger's handlers.
+    """
+    global _pipeline
+    log_format = log_format or os.environ.get(LOG_FORMAT_ENV)
+    log_dir = log_dir or os.environ.get(LOG_DIR_ENV)
+    if _pipeline is not None or not (log_format or log_dir):
+        return _pipeline
+
+    root = logging.getLogger()
+    handlers = list(root.handlers) or [logging.StreamHandler()]
+    if log_dir:
+        file_handler = TaskFileHandler(log_dir)
+        # Use the same format as the console
+        file_handler.setFormatter(handlers[0].formatter)
+        handlers.append(file_handler)
+    if log_format == "json":
+        for handler in handlers:
+            handler.setFormatter(JsonLinesFormatter())
+
+    _pipeline = LogPipeline(handlers)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_pipeline.handler)
+    _pipeline.start()
+    return _pipeline
@@ -0,0 +1,123 @@
+"""Phase timings and resource usage for a CLI run, exported as JSON or an OpenMetrics textfile."""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# The (phase, task_id) of the innermost span running in this thread or task, for tagging log records
+current_span: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar("current_span", default=(None, None))
+
+
+@contextmanager
+def log_scope(phase: Optional[str], task_id: Optional[str]) -> Iterator[None]:
+    """Tag the log records of a block with ``phase`` and ``task_id``, without timing it."""
+    token = current_span.set((phase, task_id))
+    try:
+        yield
+    finally:
+        current_span.reset(token)
+
+
+class RunMetrics:
+    """Collects timing spans for the phases of every task run in this process."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self.profile_path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def add_span(self, phase: str, started: float, ended: float, task_id: Optional[str] = None) -> None:
+        span = {"phase": phase, "task_id": task_id, "start": started - self.started, "duration": ended - started}
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, phase: str, task_id: Optional[str] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        with log_scope(phase, task_id):
+            try:
+                yield
+            finally:
+                self.add_span(phase, started, time.perf_counter(), task_id)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        phases: Dict[str, float] = {}
+        for span in self.spans:
+            phases[span["phase"]] = phases.get(span["phase"], 0.0) + span["duration"]
+        summary = {
+            "wall_seconds": time.perf_counter() - self.started,
+            "phases": phases,
+            "spans": list(self.spans),
+            "counters": dict(self.counters),
+        }
+        if resource is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            summary["peak_rss_bytes"] = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+            summary["cpu_user_seconds"] = usage.ru_utime
+            summary["cpu_system_seconds"] = usage.ru_stime
+        return summary
+
+    def write_json(self, path: str) -> None:
+        _write_atomic(path, json.dumps(self.summary(), indent=2) + "\n")
+
+    def write_openmetrics(self, path: str) -> None:
+        """Write an OpenMetrics textfile, e.g. for the node exporter's textfile collector."""
+        summary = self.summary()
+        # Series must be unique, so repeated phases of the same task are summed
+        durations: Dict[tuple, float] = {}
+        for span in summary["spans"]:
+            key = (span["phase"], span["task_id"])
+            durations[key] = durations.get(key, 0.0) + span["duration"]
+        lines = ["# TYPE execute_any_operator_phase_seconds gauge"]
+        for (phase, task_id), duration in durations.items():
+            labels = f'phase="{phase}"'
+            if task_id:
+                labels += f',task_id="{_escape(task_id)}"'
+            lines.append(f"execute_any_operator_phase_seconds{{{labels}}} {duration:.9f}")
+        lines += [
+            "# TYPE execute_any_operator_wall_seconds gauge",
+            f"execute_any_operator_wall_seconds {summary['wall_seconds']:.9f}",
+        ]
+        if "peak_rss_bytes" in summary:
+            lines += [
+                "# TYPE execute_any_operator_peak_rss_bytes gauge",
+                f"execute_any_operator_peak_rss_bytes {summary['peak_rss_bytes']}",
+                "# TYPE execute_any_operator_cpu_seconds gauge",
+                f'execute_any_operator_cpu_seconds{{mode="user"}} {summary["cpu_user_seconds"]:.6f}',
+                f'execute_any_operator_cpu_seconds{{mode="system"}} {summary["cpu_system_seconds"]:.6f}',
+            ]
+        for counter, value in sorted(summary["counters"].items()):
+            lines += [f"# TYPE execute_any_operator_{counter} counter", f"execute_any_operator_{counter}_total {value}"]
+        lines.append("# EOF")
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: str, content: str) -> None:
+    # Scrapers must never see a half written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+metrics = RunMetrics()
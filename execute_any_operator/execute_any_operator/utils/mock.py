@@ -1,11 +1,11 @@
-import os
 from typing import Any, Iterable, Optional, Union
 from unittest.mock import patch
 
 from execute_any_operator.utils.alchemy_mock import mockSession
+from execute_any_operator.utils.variables import variable_store
 
 with patch("sqlalchemy.orm.scoped_session", mockSession):
-    from airflow.models.taskinstance import TaskInstance
+    from airflow.models.taskinstance import XCOM_RETURN_KEY, TaskInstance
     from airflow.models.variable import Variable
     from airflow.models.xcom import XCom
     from airflow.utils.helpers import is_container
@@ -16,7 +16,7 @@ class _Variable(Variable):
     def get(
         cls, key: str, default_var: Any = ..., deserialize_json: bool = False
     ) -> Any:
-        return os.getenv(key.upper())
+        return variable_store.get(key, default_var=default_var, deserialize_json=deserialize_json)
 
 
 class _TaskInstance(TaskInstance):
@@ -29,9 +29,14 @@ class _TaskInstance(TaskInstance):
             value=value,
             task_id=self.task_id,
             dag_id=self.dag_id,
+            run_id=self.run_id,
         )
 
-    def xcom_pull(self, task_ids: Optional[Union[str, Iterable[str]]] = None, dag_id: Optional[str] = None, key: str = ..., **kwargs) -> Any:
+    def xcom_pull(self, task_ids: Optional[Union[str, Iterable[str]]] = None, dag_id: Optional[str] = None, key: str = XCOM_RETURN_KEY, **kwargs) -> Any:
+        # Values may come from an earlier invocation with a different run id, so no run_id filter here
+        dag_id = dag_id or self.dag_id
+        if task_ids is None:
+            task_ids = self.task_id
         if is_container(task_ids):
             return XCom.get_many(
                 key=key,
@@ -0,0 +1,169 @@
+"""An opt-in, on-disk cache of operator results keyed by what the operator is given.
+
+The key is a hash of the operator path, its normalized keyword arguments (with the source
+of callables) and the environment the operator reads: the ``AIRFLOW_CONN_*`` and
+``AIRFLOW_VAR_*`` variables, the ``--env-var`` keys, the task's own env overlay, whether
+templates are rendered and the variables file. Variables such as ``HOSTNAME`` or ``PWD``
+are left out, so keys match across shells and containers. A hit replays the stored return
+value and XComs without running the operator. Entries expire after a TTL, and the least
+recently used entries are evicted once the cache grows beyond its size limit. Only use it
+for idempotent invocations.
+"""
+import hashlib
+import inspect
+import json
+import marshal
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from execute_any_operator.utils.isolation import cli_env_keys, environ, task_overlay
+from execute_any_operator.utils.metrics import metrics
+from execute_any_operator.utils.templating import rendering_enabled
+from execute_any_operator.utils.variables import VARIABLES_FILE_ENV
+
+CACHE_DIR_ENV = "EXECUTE_ANY_OPERATOR_CACHE_DIR"
+CACHE_TTL_ENV = "EXECUTE_ANY_OPERATOR_CACHE_TTL"
+CACHE_MAX_BYTES_ENV = "EXECUTE_ANY_OPERATOR_CACHE_MAX_BYTES"
+
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# Connections and variables, which operators read through the patched models
+_KEYED_ENV_PREFIXES = ("AIRFLOW_CONN_", "AIRFLOW_VAR_")
+
+
+def _callable_fingerprint(func: Any) -> str:
+    """A hash of a callable's source, or of its bytecode when the source isn't available."""
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        source = marshal.dumps(code) if code is not None else repr(func).encode()
+    return hashlib.sha256(source).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(v) for v in value), key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if callable(value):
+        name = f"{getattr(value, '__module__', '')}:{getattr(value, '__qualname__', repr(value))}"
+        return f"{name}@{_callable_fingerprint(value)}"
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def _environment() -> Dict[str, Any]:
+    env = environ()
+    keys = {k for k in env if k.startswith(_KEYED_ENV_PREFIXES)}
+    keys.update(cli_env_keys(), task_overlay() or ())
+    variables_file = env.get(VARIABLES_FILE_ENV)
+    return {
+        "env": {k: env.get(k) for k in keys},
+        "render_templates": rendering_enabled(),
+        "variables_file": [variables_file, os.stat(variables_file).st_mtime_ns]
+        if variables_file and os.path.exists(variables_file)
+        else None,
+    }
+
+
+class ResultCache:
+    """Stores one JSON file per key in ``directory``."""
+
+    def __init__(self, directory: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def key(self, operator: str, kwargs: Dict[str, Any]) -> str:
+        payload = {"operator": operator, "kwargs": _normalize(kwargs), **_environment()}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored result for ``key``, or ``None`` when it is missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            metrics.increment("result_cache_misses")
+            return None
+        if time.time() - result["created"] > self.ttl:
+            self._remove(path)
+            metrics.increment("result_cache_misses")
+            return None
+        # The modification time tracks the last use, for LRU eviction
+        os.utime(path)
+        metrics.increment("result_cache_hits")
+        return result
+
+    def put(self, key: str, return_value: Any, xcom: Dict[str, Any], **extra: Any) -> bool:
+        """Store a result, returning ``False`` when it can't be stored as JSON."""
+        result = {"created": time.time(), "return_value": return_value, "xcom": xcom, **extra}
+        try:
+            content = json.dumps(result)
+        except (TypeError, ValueError):
+            return False
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in ``max_bytes``."""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_caches: Dict[tuple, ResultCache] = {}
+
+
+def result_cache() -> Optional[ResultCache]:
+    """The cache configured with ``--cache-dir`` (or ``EXECUTE_ANY_OPERATOR_CACHE_DIR``), if any."""
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    config = (
+        directory,
+        float(os.environ.get(CACHE_TTL_ENV, DEFAULT_TTL)),
+        int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES)),
+    )
+    if config not in _caches:
+        _caches[config] = ResultCache(*config)
+    return _caches[config]
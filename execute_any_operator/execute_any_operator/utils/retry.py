@@ -0,0 +1,24 @@
+"""Retry scheduling for running a task's attempts in-process."""
+import math
+import random
+from datetime import timedelta
+from typing import Union
+
+
+def _seconds(value: Union[timedelta, float]) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+def retry_delay(task, try_number: int) -> float:
+    """Seconds to wait after the ``try_number``-th attempt of ``task`` failed, following ``TaskInstance`` semantics.
+
+    With ``retry_exponential_backoff`` the delay doubles every try, with a random jitter of
+    up to the same amount again. The delay is capped by ``max_retry_delay`` when it is set.
+    """
+    delay = _seconds(task.retry_delay)
+    if task.retry_exponential_backoff:
+        min_backoff = math.ceil(delay * 2 ** (try_number - 1))
+        delay = random.uniform(min_backoff, 2 * min_backoff)
+    if task.max_retry_delay:
+        delay = min(delay, _seconds(task.max_retry_delay))
+    return delay
@@ -0,0 +1,163 @@
+"""Check many S3 keys with a few paginated ListObjectsV2 calls instead of a request per key."""
+import fnmatch
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from execute_any_operator.utils.sensors import next_poke_interval, poke_schedule
+
+_WILDCARD = re.compile(r"[*?\[]")
+
+
+def parse_key(key: str, bucket_name: Optional[str] = None) -> Tuple[str, str]:
+    """Split ``key`` into ``(bucket, key)``, accepting either a full s3:// url or a bucket-relative key."""
+    parsed = urlparse(key)
+    if parsed.scheme == "s3":
+        return parsed.netloc, parsed.path.lstrip("/")
+    if not bucket_name:
+        raise ValueError(f"Key {key} is not an s3:// url and no bucket name was given")
+    return bucket_name, key
+
+
+def listing_prefix(key: str, wildcard_match: bool = False) -> str:
+    """The prefix to list to find ``key``: its "directory", or everything before the first wildcard."""
+    if wildcard_match:
+        match = _WILDCARD.search(key)
+        if match:
+            return key[: match.start()]
+    return key[: key.rfind("/") + 1]
+
+
+class S3Listing:
+    """Lists and heads S3 objects, counting the requests made."""
+
+    def __init__(self, client):
+        self.client = client
+        self.list_requests = 0
+        self.head_requests = 0
+
+    def refresh(self, bucket: str, prefix: str) -> Dict[str, int]:
+        """Every object under ``prefix``."""
+        objects = {}
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+            self.list_requests += 1
+            for obj in page.get("Contents", []):
+                objects[obj["Key"]] = obj["Size"]
+        return objects
+
+    def find(self, bucket: str, keys: List[str]) -> Dict[str, int]:
+        """The sizes of those of ``keys`` that exist.
+
+        Only the range from the first to the last key is listed, under the keys' longest
+        common prefix. Once the listing has taken as many requests as there are keys, the
+        keys not reached yet are checked with a HEAD request each instead, so finding keys
+        never costs more than twice as many requests as heading every key.
+        """
+        keys = sorted(keys)
+        wanted, last = set(keys), keys[-1]
+        found: Dict[str, int] = {}
+        pages = self.client.get_paginator("list_objects_v2").paginate(
+            Bucket=bucket,
+            Prefix=os.path.commonprefix(keys),
+            # StartAfter is exclusive, and a key's own prefix sorts right before it
+            StartAfter=keys[0][:-1],
+        )
+        listed_up_to = ""
+        for requests, page in enumerate(pages, start=1):
+            self.list_requests += 1
+            contents = page.get("Contents", [])
+            for obj in contents:
+                if obj["Key"] in wanted:
+                    found[obj["Key"]] = obj["Size"]
+            if contents:
+                listed_up_to = contents[-1]["Key"]
+            if listed_up_to >= last or not page.get("IsTruncated"):
+                return found
+            if requests >= len(keys):
+                break
+        for key in keys:
+            if key > listed_up_to:
+                size = self.head(bucket, key)
+                if size is not None:
+                    found[key] = size
+        return found
+
+    def head(self, bucket: str, key: str) -> Optional[int]:
+        """The size of ``key``, or ``None`` when it doesn't exist."""
+        from botocore.exceptions import ClientError
+
+        self.head_requests += 1
+        try:
+            return self.client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+
+def check_keys(
+    client,
+    keys: Iterable[str],
+    bucket_name: Optional[str] = None,
+    wildcard_match: bool = False,
+    poke_interval: float = 60,
+    timeout: float = 60 * 60 * 24 * 7,
+    exponential_backoff: bool = False,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Poke until every key exists or ``timeout`` passes.
+
+    Keys are grouped by bucket and "directory". Each poke lists only the range between the
+    first and last missing key of a group, and found keys are not checked again. Wildcard
+    patterns resolve against a listing of everything before their first wildcard. Returns
+    one status record per key plus a summary with the number of requests made.
+    """
+    statuses = {}
+    groups = defaultdict(list)
+    for key in dict.fromkeys(keys):
+        bucket, object_key = parse_key(key, bucket_name)
+        statuses[key] = {"key": key, "bucket": bucket, "object_key": object_key, "found": False}
+        groups[(bucket, listing_prefix(object_key, wildcard_match))].append(key)
+
+    listing = S3Listing(client)
+    schedule = poke_schedule("s3_bulk_check", poke_interval, timeout, exponential_backoff)
+    started, started_at, pokes = time.monotonic(), time.time(), 0
+    while True:
+        pokes += 1
+        for (bucket, prefix), group_keys in groups.items():
+            pending = [key for key in group_keys if not statuses[key]["found"]]
+            if not pending:
+                continue
+            if wildcard_match:
+                objects = listing.refresh(bucket, prefix)
+                for key in pending:
+                    matches = fnmatch.filter(objects, statuses[key]["object_key"])
+                    if matches:
+                        statuses[key].update(found=True, matches=sorted(matches))
+                continue
+            objects = listing.find(bucket, [statuses[key]["object_key"] for key in pending])
+            for key in pending:
+                status = statuses[key]
+                if status["object_key"] in objects:
+                    status.update(found=True, size=objects[status["object_key"]])
+
+        missing = sum(not status["found"] for status in statuses.values())
+        elapsed = time.monotonic() - started
+        if not missing or elapsed > timeout:
+            break
+        time.sleep(next_poke_interval(schedule, started_at, pokes, elapsed))
+
+    summary = {
+        "keys": len(statuses),
+        "found": len(statuses) - missing,
+        "missing": missing,
+        "pokes": pokes,
+        "list_requests": listing.list_requests,
+        "head_requests": listing.head_requests,
+        "duration": round(time.monotonic() - started, 6),
+    }
+    for status in statuses.values():
+        del status["object_key"]
+    return list(statuses.values()), summary
@@ -0,0 +1,112 @@
+"""Helpers for driving sensor pokes outside of ``BaseSensorOperator.execute``."""
+import hashlib
+import json
+import os
+import time
+from contextlib import suppress
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+# EX_TEMPFAIL: the sensor is not satisfied yet and should be invoked again later
+RESCHEDULE_EXIT_CODE = 75
+
+
+def next_poke_interval(sensor, started_at: float, try_number: int, elapsed: float) -> float:
+    """Seconds to wait before the next poke, following ``BaseSensorOperator`` semantics.
+
+    With ``exponential_backoff`` the wait doubles every try, with a deterministic jitter
+    derived from the task and start time, and is capped by the remaining timeout and by
+    ``max_wait`` when the sensor has one.
+    """
+    if not sensor.exponential_backoff:
+        return sensor.poke_interval
+
+    min_backoff = max(int(sensor.poke_interval * (2 ** (try_number - 2))), 1)
+    run_hash = int(
+        hashlib.sha1(f"{sensor.dag_id}#{sensor.task_id}#{started_at}#{try_number}".encode()).hexdigest(), 16
+    )
+    delay_backoff = min(min_backoff + run_hash % min_backoff, timedelta.max.total_seconds() - 1)
+    interval = max(min(sensor.timeout - elapsed, delay_backoff), 0)
+    max_wait = getattr(sensor, "max_wait", None)
+    if max_wait:
+        interval = min(interval, max_wait.total_seconds() if isinstance(max_wait, timedelta) else max_wait)
+    return interval
+
+
+def poke_schedule(name: str, poke_interval: float, timeout: float, exponential_backoff: bool = False) -> SimpleNamespace:
+    """The scheduling attributes ``next_poke_interval`` reads from a sensor, for poke loops that have no sensor."""
+    return SimpleNamespace(
+        poke_interval=poke_interval,
+        timeout=timeout,
+        exponential_backoff=exponential_backoff,
+        dag_id=name,
+        task_id=name,
+    )
+
+
+def poke_result(result):
+    """Split a poke's return value into ``(done, xcom_value)``; newer sensors return ``PokeReturnValue``."""
+    if hasattr(result, "is_done"):
+        return bool(result.is_done), getattr(result, "xcom_value", None)
+    return bool(result), None
+
+
+def load_sensor_state(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_sensor_state(path: str, state: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def clear_sensor_state(path: str) -> None:
+    with suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def poke_rescheduled(task, state_file: str) -> Tuple[bool, Any, Dict[str, Any]]:
+    """Poke the sensor wrapped by ``task`` once, resuming from and checkpointing to ``state_file``.
+
+    Returns ``(done, xcom_value, state)``. When the sensor is not satisfied the state, with
+    the start time, number of pokes and time of the next poke, is written to ``state_file``
+    so that the next invocation keeps the sensor's timeout and backoff. An invocation before
+    the next poke is due does not poke. The state file is removed once the sensor succeeds
+    or times out, raising ``AirflowSensorTimeout`` (or ``AirflowSkipException`` with ``soft_fail``).
+    """
+    from airflow.exceptions import AirflowSensorTimeout, AirflowSkipException
+
+    sensor = task.task
+    now = time.time()
+    state = load_sensor_state(state_file)
+    if state is None:
+        state = {"task_id": task.task_id, "started_at": now, "try_number": 0}
+    elif state.get("task_id") != task.task_id:
+        raise ValueError(f"State file {state_file} belongs to task {state.get('task_id')}, not {task.task_id}")
+    if now < state.get("next_poke_at", 0):
+        return False, None, state
+
+    task.render_templates()
+    done, xcom_value = poke_result(sensor.poke(task.context))
+    state["try_number"] += 1
+    now = time.time()
+    elapsed = now - state["started_at"]
+    if done:
+        clear_sensor_state(state_file)
+        return True, xcom_value, state
+    if elapsed > sensor.timeout:
+        clear_sensor_state(state_file)
+        message = f"Snap. Time is OUT. DAG id: {sensor.dag_id}"
+        raise AirflowSkipException(message) if sensor.soft_fail else AirflowSensorTimeout(message)
+
+    interval = next_poke_interval(sensor, state["started_at"], state["try_number"], elapsed)
+    state.update(next_poke_at=now + interval, next_poke_interval=interval)
+    save_sensor_state(state_file, state)
+    return False, None, state
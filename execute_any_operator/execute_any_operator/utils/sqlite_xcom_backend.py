@@ -0,0 +1,143 @@
+"""An XCom backend persisted to a SQLite database, so separate CLI invocations can share XComs.
+
+Enable it with::
+
+    AIRFLOW__CORE__XCOM_BACKEND=execute_any_operator.utils.sqlite_xcom_backend.SqliteXComBackend
+    EXECUTE_ANY_OPERATOR_XCOM_DB=/shared/xcom.db
+
+The database runs in WAL mode so readers never block the writer. Rows are keyed by
+``(dag_id, task_id, key, run_id)``. Reads without a ``run_id`` return the latest value,
+which is what a follow-up invocation with a new run id needs.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Iterable, Optional, Tuple, Union
+
+from airflow.models.xcom import BaseXCom
+from airflow.utils.helpers import is_container
+from execute_any_operator.utils.dict_xcom_backend import _deserialize
+
+XCOM_DB_ENV = "EXECUTE_ANY_OPERATOR_XCOM_DB"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS xcom (
+    dag_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    value BLOB,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (dag_id, task_id, key, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS xcom_latest ON xcom (dag_id, task_id, key, timestamp);
+"""
+
+_local = threading.local()
+
+
+def _db_path() -> str:
+    return os.environ.get(XCOM_DB_ENV) or os.path.join(tempfile.gettempdir(), "execute_any_operator_xcom.db")
+
+
+def _connection() -> sqlite3.Connection:
+    # One connection per thread and process: sqlite connections must not cross either boundary
+    path = _db_path()
+    cached = getattr(_local, "conn", None)
+    if cached is not None and cached[0] == (os.getpid(), path):
+        return cached[1]
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = ((os.getpid(), path), conn)
+    return conn
+
+
+class SqliteXComBackend(BaseXCom):
+
+    @classmethod
+    def set(cls, key, value, task_id, dag_id, run_id: Optional[str] = None, **kwargs):
+        """
+        Store an XCom value.
+
+        :return: None
+        """
+        value = BaseXCom.serialize_value(value)
+
+        _connection().execute(
+            "INSERT OR REPLACE INTO xcom (dag_id, task_id, key, run_id, value, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (dag_id, task_id, key, run_id or "", value, time.time()),
+        )
+
+    @classmethod
+    def set_many(cls, xcoms: Iterable[Tuple[str, Any, str, str]], run_id: Optional[str] = None, **kwargs) -> None:
+        """
+        Store many XCom values, given as ``(key, value, task_id, dag_id)`` tuples, in one transaction.
+
+        :return: None
+        """
+        now = time.time()
+        rows = [
+            (dag_id, task_id, key, run_id or "", BaseXCom.serialize_value(value), now)
+            for key, value, task_id, dag_id in xcoms
+        ]
+        conn = _connection()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO xcom (dag_id, task_id, key, run_id, value, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @classmethod
+    def get_one(cls, key: Optional[str] = None, task_id: Optional[Union[str, Iterable[str]]] = None, dag_id: Optional[Union[str, Iterable[str]]] = None, run_id: Optional[str] = None, **kwargs) -> Optional[Any]:
+        results = cls.get_many(key=key, task_ids=task_id, dag_ids=dag_id, run_id=run_id)
+        if results:
+            return results[0]
+        return None
+
+    @classmethod
+    def get_many(cls, key: Optional[str] = None, task_ids: Optional[Union[str, Iterable[str]]] = None, dag_ids: Optional[Union[str, Iterable[str]]] = None, run_id: Optional[str] = None, **kwargs) -> Iterable[Any]:
+        if not is_container(task_ids):
+            task_ids = [task_ids]
+
+        if not is_container(dag_ids):
+            dag_ids = [dag_ids]
+
+        conn = _connection()
+        if run_id is None:
+            query = "SELECT value FROM xcom WHERE dag_id = ? AND task_id = ? AND key = ? ORDER BY timestamp DESC LIMIT 1"
+            extra = ()
+        else:
+            query = "SELECT value FROM xcom WHERE dag_id = ? AND task_id = ? AND key = ? AND run_id = ?"
+            extra = (run_id,)
+
+        results = []
+        for dag_id in dag_ids:
+            for task_id in task_ids:
+                row = conn.execute(query, (dag_id, task_id, key, *extra)).fetchone()
+                if row is not None:
+                    results.append(_deserialize(row[0]))
+        return tuple(results)
+
+    @classmethod
+    def delete(cls, xcoms, **kwargs):
+        if not is_container(xcoms):
+            xcoms = [xcoms]
+
+        _connection().executemany(
+            "DELETE FROM xcom WHERE dag_id = ? AND task_id = ? AND key = ?",
+            [(xcom.dag_id, xcom.task_id, xcom.key) for xcom in xcoms],
+        )
+
+    @classmethod
+    def clear(cls, dag_id: str = None, task_id: str = None, run_id: Optional[str] = None, **kwargs) -> None:
+        if run_id is None:
+            _connection().execute("DELETE FROM xcom WHERE dag_id = ? AND task_id = ?", (dag_id, task_id))
+        else:
+            _connection().execute(
+                "DELETE FROM xcom WHERE dag_id = ? AND task_id = ? AND run_id = ?", (dag_id, task_id, run_id)
+            )
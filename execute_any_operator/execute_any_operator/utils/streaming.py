@@ -0,0 +1,101 @@
+"""Copy a subprocess' output to sinks as it arrives, keeping only a bounded tail in memory."""
+import os
+import sys
+from collections import deque
+from typing import IO, BinaryIO, Deque, Iterable, List
+
+CHUNK_SIZE = 64 * 1024
+
+# Set while stdout carries JSON Lines records, which streamed output must not mix into.
+# Forked pool workers inherit it.
+_records_on_stdout = False
+
+
+def reserve_stdout(output: IO[str]) -> None:
+    """Send streamed output to stderr from now on if ``output``, a records file, is stdout."""
+    global _records_on_stdout
+    try:
+        is_stdout = output.fileno() == sys.__stdout__.fileno()
+    except (AttributeError, OSError, ValueError):
+        is_stdout = getattr(output, "name", None) == "<stdout>"
+    if is_stdout:
+        _records_on_stdout = True
+
+
+def output_sink() -> BinaryIO:
+    """Where streamed output goes: stdout, unless it is reserved for records."""
+    return sys.stderr.buffer if _records_on_stdout else sys.stdout.buffer
+
+
+class TailBuffer:
+    """A ring buffer of the last ``max_lines`` lines fed to it, each capped at ``max_line_bytes``."""
+
+    def __init__(self, max_lines: int, max_line_bytes: int = CHUNK_SIZE):
+        self.lines: Deque[bytes] = deque(maxlen=max_lines)
+        self.max_line_bytes = max_line_bytes
+        self._partial = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        if not self.lines.maxlen:
+            return
+        # Only the last max_lines lines of a chunk can end up in the buffer, so only those are split
+        *complete, rest = chunk.rsplit(b"\n", self.lines.maxlen)
+        if complete:
+            first = complete[0]
+            newline = first.rfind(b"\n")
+            if newline == -1:
+                self._add_partial(first)
+                complete[0] = bytes(self._partial)
+            else:
+                complete[0] = first[newline + 1 :]
+            self.lines.extend(line[: self.max_line_bytes] for line in complete)
+            self._partial.clear()
+        self._add_partial(rest)
+
+    def _add_partial(self, data: bytes) -> None:
+        # Overlong lines are truncated rather than buffered whole
+        room = self.max_line_bytes - len(self._partial)
+        if room > 0:
+            self._partial += data[:room]
+
+    def tail(self) -> List[bytes]:
+        """The buffered lines, including an unterminated last line."""
+        lines = list(self.lines)
+        if self._partial:
+            lines = (lines + [bytes(self._partial)])[-self.lines.maxlen :]
+        return lines
+
+
+def stream_output(fd: int, sinks: Iterable[BinaryIO], tail: TailBuffer) -> int:
+    """Copy everything read from ``fd`` to every sink until EOF, returning the number of bytes copied.
+
+    Output is forwarded in whole lines, so it never breaks off mid-line. A line longer than
+    ``CHUNK_SIZE`` is forwarded in pieces, to keep memory bounded.
+    """
+    sinks = list(sinks)
+    total = 0
+    partial = b""
+
+    def forward(data: bytes) -> None:
+        for sink in sinks:
+            sink.write(data)
+            sink.flush()
+
+    while True:
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            if partial:
+                forward(partial)
+            return total
+        total += len(chunk)
+        tail.feed(chunk)
+        data = partial + chunk
+        end = data.rfind(b"\n") + 1
+        if end:
+            forward(data[:end])
+            partial = data[end:]
+        else:
+            partial = data
+        if len(partial) >= CHUNK_SIZE:
+            forward(partial)
+            partial = b""
@@ -0,0 +1,108 @@
+"""Jinja rendering of operator ``template_fields`` with environments and compiled templates reused across tasks.
+
+Airflow builds a new Jinja environment for every task and compiles every templated string
+from scratch. Here tasks without a DAG share one environment, tasks of the same DAG share
+that DAG's environment, and each environment keeps an LRU cache of compiled templates keyed
+by their source, so a batch of tasks with the same templates only compiles them once.
+"""
+import functools
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import jinja2
+
+TEMPLATE_CACHE_SIZE = 1024
+
+# Set from --render-templates. Pool workers get it passed on, so it never goes through os.environ.
+_rendering_enabled = False
+
+
+class _CompiledTemplateCache:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compile_cached = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(super().from_string)
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None or not isinstance(source, str):
+            return super().from_string(source, globals, template_class)
+        return self._compile_cached(source)
+
+
+@functools.lru_cache(maxsize=None)
+def _environment_class(native: bool) -> type:
+    # Airflow is only imported once a template is rendered, so the CLI can set the flag without it
+    from airflow.templates import NativeEnvironment, SandboxedEnvironment
+
+    base = NativeEnvironment if native else SandboxedEnvironment
+    return type(f"Caching{base.__name__}", (_CompiledTemplateCache, base), {})
+
+
+_environments: Dict[Any, "jinja2.Environment"] = {}
+_lock = threading.Lock()
+
+
+def _default_environment() -> "jinja2.Environment":
+    import jinja2
+
+    # Template files such as "script.sh" are looked up relative to the working directory,
+    # absolute paths relative to the root
+    return _environment_class(native=False)(
+        loader=jinja2.FileSystemLoader([os.getcwd(), "/"]),
+        undefined=jinja2.StrictUndefined,
+        extensions=["jinja2.ext.do"],
+        cache_size=0,
+    )
+
+
+def _dag_environment(dag) -> "jinja2.Environment":
+    """The equivalent of ``DAG.get_template_env`` with compiled templates cached."""
+    import jinja2
+
+    searchpath = [dag.folder]
+    if dag.template_searchpath:
+        searchpath += dag.template_searchpath
+    options = {
+        "loader": jinja2.FileSystemLoader(searchpath),
+        "undefined": dag.template_undefined,
+        "extensions": ["jinja2.ext.do"],
+        "cache_size": 0,
+    }
+    if dag.jinja_environment_kwargs:
+        options.update(dag.jinja_environment_kwargs)
+    env_class = _environment_class(native=bool(dag.render_template_as_native_obj))
+    env = env_class(**options)
+    if dag.user_defined_macros:
+        env.globals.update(dag.user_defined_macros)
+    if dag.user_defined_filters:
+        env.filters.update(dag.user_defined_filters)
+    return env
+
+
+def template_environment(dag=None) -> "jinja2.Environment":
+    """The shared environment for tasks of ``dag``, or for tasks without a DAG."""
+    key = None if dag is None else (dag.dag_id, id(dag))
+    env = _environments.get(key)
+    if env is None:
+        env = _default_environment() if dag is None else _dag_environment(dag)
+        with _lock:
+            env = _environments.setdefault(key, env)
+    return env
+
+
+def set_rendering_enabled(enabled: bool) -> None:
+    global _rendering_enabled
+    _rendering_enabled = enabled
+
+
+def rendering_enabled() -> bool:
+    """Whether ``--render-templates`` was given; rendering is opt-in."""
+    return _rendering_enabled
+
+
+def render_template_fields(task, context: Dict[str, Any], dag: Optional[Any] = None) -> None:
+    """Render ``task``'s template fields in place against ``context``."""
+    if not task.template_fields:
+        return
+    task.render_template_fields(context, jinja_env=template_environment(dag))
@@ -0,0 +1,105 @@
+"""Variable providers backing the patched ``Variable.get``.
+
+Values are looked up in the task's environment first (``KEY`` or ``AIRFLOW_VAR_KEY``) and
+then in an optional JSON/YAML variables file, set with ``--variables-file`` or the
+``EXECUTE_ANY_OPERATOR_VARIABLES_FILE`` environment variable. Every read returns its own
+copy of a mutable value, parsed from the raw value, so a task changing it can't affect others.
+"""
+import json
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional
+
+from execute_any_operator.utils.isolation import getenv
+
+VARIABLES_FILE_ENV = "EXECUTE_ANY_OPERATOR_VARIABLES_FILE"
+
+_MISSING = object()
+
+_IMMUTABLE = (str, int, float, bool, type(None))
+
+
+class EnvVariableProvider:
+    def get(self, key: str) -> Any:
+        value = getenv(key.upper())
+        if value is None:
+            value = getenv(f"AIRFLOW_VAR_{key.upper()}")
+        return _MISSING if value is None else value
+
+
+class FileVariableProvider:
+    """Variables from a JSON or YAML mapping file, re-read only when its mtime changes.
+
+    Mutable values are kept pickled and unpickled on every read, which is much cheaper than a deepcopy.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+        self._variables: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        with open(self.path) as f:
+            if self.path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError(f"PyYAML is required to read the variables file {self.path}")
+                variables = yaml.safe_load(f)
+            else:
+                variables = json.load(f)
+        if not isinstance(variables, dict):
+            raise ValueError(f"Variables file {self.path} must contain a mapping of keys to values")
+        return variables
+
+    def _current(self) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._variables = {
+                        key: value if isinstance(value, _IMMUTABLE) else pickle.dumps(value)
+                        for key, value in self._load().items()
+                    }
+                    self._mtime = mtime
+        return self._variables
+
+    def get(self, key: str) -> Any:
+        value = self._current().get(key, _MISSING)
+        return pickle.loads(value) if isinstance(value, bytes) else value
+
+
+class VariableStore:
+    def __init__(self):
+        self.env = EnvVariableProvider()
+        self._files: Dict[str, FileVariableProvider] = {}
+
+    def _file_provider(self) -> Optional[FileVariableProvider]:
+        path = os.environ.get(VARIABLES_FILE_ENV)
+        if not path:
+            return None
+        if path not in self._files:
+            self._files[path] = FileVariableProvider(path)
+        return self._files[path]
+
+    def get(self, key: str, default_var: Any = ..., deserialize_json: bool = False) -> Any:
+        value = self.env.get(key)
+        if value is _MISSING:
+            file_provider = self._file_provider()
+            if file_provider is not None:
+                value = file_provider.get(key)
+        if value is _MISSING:
+            if default_var is not ...:
+                return default_var
+            raise KeyError(f"Variable {key} does not exist")
+        if deserialize_json and isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+variable_store = VariableStore()
@@ -0,0 +1,72 @@
+"""Poke many sensors concurrently from a single asyncio event loop."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from execute_any_operator.operators import ensure_airflow_patched
+from execute_any_operator.utils.batch import _entry_kwargs
+from execute_any_operator.utils.isolation import isolated_env
+from execute_any_operator.utils.sensors import next_poke_interval, poke_result
+
+
+def _build_sensor(index: int, spec: Dict[str, Any]):
+    from execute_any_operator.operators.execute_any import ExecuteAnyOperator
+
+    task = ExecuteAnyOperator(operator=spec["operator"], **_entry_kwargs(index, spec))
+    # Rendered once, before the first poke, as in reschedule mode
+    task.render_templates()
+    return task
+
+
+def _in_env(env: Optional[Dict[str, str]], func: Callable, *args: Any) -> Any:
+    """Call ``func`` with the spec's ``env`` overlay; executor threads don't inherit the caller's."""
+    with isolated_env(env):
+        return func(*args)
+
+
+async def _watch_one(index: int, spec: Dict[str, Any], executor: ThreadPoolExecutor) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    record = {"index": index, "operator": spec.get("operator"), "task_id": None, "state": "failed", "pokes": 0}
+    started = time.monotonic()
+    try:
+        env = spec.get("env")
+        task = await loop.run_in_executor(executor, _in_env, env, _build_sensor, index, spec)
+        sensor = task.task
+        record["task_id"] = task.task_id
+        started_at = time.time()
+        while True:
+            record["pokes"] += 1
+            # Pokes block (boto3, pyarrow, ...), so they run on the bounded executor
+            done, xcom_value = poke_result(await loop.run_in_executor(executor, _in_env, env, sensor.poke, task.context))
+            elapsed = time.monotonic() - started
+            if done:
+                record["state"] = "success"
+                if xcom_value is not None:
+                    record["xcom_value"] = xcom_value
+                break
+            if elapsed > sensor.timeout:
+                record["state"] = "skipped" if sensor.soft_fail else "timeout"
+                break
+            await asyncio.sleep(next_poke_interval(sensor, started_at, record["pokes"], elapsed))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration"] = round(time.monotonic() - started, 6)
+    return record
+
+
+async def watch(specs: Iterable[Tuple[int, Dict[str, Any]]], workers: int = 16) -> AsyncIterator[Dict[str, Any]]:
+    """Watch every sensor spec until it succeeds, times out or fails, yielding records as they resolve.
+
+    Each sensor keeps its own ``poke_interval``, ``timeout`` and ``exponential_backoff``.
+    At most ``workers`` pokes run at the same time.
+    """
+    ensure_airflow_patched()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        watchers = [asyncio.ensure_future(_watch_one(index, spec, executor)) for index, spec in specs]
+        try:
+            for watcher in asyncio.as_completed(watchers):
+                yield await watcher
+        finally:
+            for watcher in watchers:
+                watcher.cancel()
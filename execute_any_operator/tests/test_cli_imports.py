@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from execute_any_operator.entrypoint import cli
+
+# Runs the CLI the way the console script does, then reports which Airflow modules got imported
+_RUN_HELP = """
+import json, sys
+from execute_any_operator.entrypoint import cli
+try:
+    cli.main(sys.argv[1:], prog_name="execute-any-operator")
+except SystemExit:
+    pass
+print(json.dumps(sorted(name for name in sys.modules if name.split(".")[0] == "airflow")), file=sys.stderr)
+"""
+
+
+def _airflow_modules_imported(*args: str):
+    result = subprocess.run([sys.executable, "-c", _RUN_HELP, *args], capture_output=True, text=True, check=True)
+    assert "Usage: execute-any-operator" in result.stdout
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def test_help_does_not_import_airflow():
+    assert _airflow_modules_imported("--help") == []
+
+
+@pytest.mark.parametrize("command", sorted(cli.lazy_subcommands))
+def test_subcommand_help_does_not_import_airflow(command):
+    assert _airflow_modules_imported(command, "--help") == []
@@ -0,0 +1,94 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+from execute_any_operator.utils.fork_server import _remove_stale_socket, submit
+
+
+def _stale_socket(path: str) -> None:
+    """Leave a socket file behind with nothing listening on it, like a daemon that was killed."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # Unix socket paths are limited to ~100 characters, which pytest's tmp_path can exceed
+    path = f"/tmp/execute-any-operator-test-{os.getpid()}.sock"
+    yield path
+    if os.path.lexists(path):
+        os.unlink(path)
+
+
+def test_remove_stale_socket(socket_path, tmp_path):
+    _remove_stale_socket(socket_path)
+
+    _stale_socket(socket_path)
+    _remove_stale_socket(socket_path)
+    assert not os.path.lexists(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+        live.bind(socket_path)
+        live.listen()
+        with pytest.raises(FileExistsError, match="already serving"):
+            _remove_stale_socket(socket_path)
+    os.unlink(socket_path)
+
+    regular_file = tmp_path / "not-a-socket"
+    regular_file.write_text("")
+    with pytest.raises(FileExistsError, match="not a socket"):
+        _remove_stale_socket(str(regular_file))
+    assert regular_file.exists()
+
+
+@pytest.fixture
+def daemon(socket_path):
+    pytest.importorskip("airflow")
+    _stale_socket(socket_path)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from execute_any_operator.entrypoint import cli; cli.main(prog_name='execute-any-operator')",
+            "serve",
+            "--socket",
+            socket_path,
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 120
+    while True:
+        assert process.poll() is None, "The daemon exited before serving"
+        assert time.monotonic() < deadline, "The daemon did not start serving in time"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.2)
+    yield socket_path
+    process.terminate()
+    process.wait(30)
+
+
+def _submit(socket_path: str, bash_command: str):
+    logs = io.StringIO()
+    request = {"operator": "airflow.operators.bash:BashOperator", "kwargs": {"bash_command": bash_command}}
+    return submit(request, socket_path=socket_path, log_stream=logs), logs.getvalue()
+
+
+def test_serve_and_submit(daemon):
+    result, logs = _submit(daemon, "echo hello from the job")
+    assert result["exit_code"] == 0
+    assert result["record"]["state"] == "success"
+    assert result["record"]["return_value"] == "hello from the job"
+    assert "hello from the job" in logs
+
+    result, logs = _submit(daemon, "echo about to fail >&2; exit 3")
+    assert result["exit_code"] == 1
+    assert result["record"]["state"] == "failed"
+    assert "about to fail" in logs
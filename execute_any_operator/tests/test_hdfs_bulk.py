@@ -0,0 +1,57 @@
+import pytest
+
+fs = pytest.importorskip("pyarrow.fs")
+
+from execute_any_operator.utils.hdfs_bulk import check_paths, normalize_path  # noqa: E402
+
+
+@pytest.fixture
+def landing(tmp_path):
+    (tmp_path / "a.csv").write_bytes(b"x" * 2048)
+    (tmp_path / "small.csv").write_bytes(b"x")
+    (tmp_path / "b.csv._COPYING_").write_bytes(b"x" * 2048)
+    (tmp_path / "part").mkdir()
+    (tmp_path / "part" / "part-0000").write_bytes(b"x" * 2048)
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def test_check_paths_on_local_filesystem(landing):
+    paths = ["a.csv", "small.csv", "b.csv._COPYING_", "part", "empty", "missing.csv", f"hdfs://namenode{landing}/a.csv"]
+    statuses, summary = check_paths(
+        fs.LocalFileSystem(), paths, file_size=1 / 1024, poke_interval=0, timeout=0, working_dir=str(landing)
+    )
+    statuses = {status["path"]: status for status in statuses}
+
+    assert statuses["a.csv"] == {"path": "a.csv", "exists": True, "found": True, "files": 1, "size": 2048}
+    assert statuses[f"hdfs://namenode{landing}/a.csv"]["found"]
+    assert statuses["small.csv"]["exists"] and not statuses["small.csv"]["found"]
+    assert statuses["b.csv._COPYING_"]["exists"] and not statuses["b.csv._COPYING_"]["found"]
+    assert statuses["part"]["found"] and statuses["part"]["files"] == 1
+    assert statuses["empty"]["exists"] and not statuses["empty"]["found"]
+    assert statuses["missing.csv"] == {"path": "missing.csv", "exists": False, "found": False}
+    assert summary["paths"] == 7 and summary["found"] == 3 and summary["pokes"] == 1
+    # One listing of the landing directory, plus one for each path that is a directory
+    assert summary["listings"] == 3
+
+
+def test_check_paths_stops_checking_found_paths(landing, monkeypatch):
+    pokes = []
+
+    def sleep(seconds):
+        pokes.append(seconds)
+        (landing / "late.csv").write_bytes(b"x")
+
+    monkeypatch.setattr("execute_any_operator.utils.hdfs_bulk.time.sleep", sleep)
+    statuses, summary = check_paths(fs.LocalFileSystem(), [f"{landing}/a.csv", f"{landing}/late.csv"], poke_interval=5)
+
+    assert all(status["found"] for status in statuses)
+    assert pokes == [5]
+    assert summary["pokes"] == 2 and summary["listings"] == 2
+
+
+def test_normalize_path_rejects_relative_paths_without_working_dir():
+    assert normalize_path("hdfs://namenode:8020/landing//a.csv") == "/landing/a.csv"
+    assert normalize_path("a.csv", "/user/etl") == "/user/etl/a.csv"
+    with pytest.raises(ValueError, match="relative"):
+        normalize_path("a.csv")
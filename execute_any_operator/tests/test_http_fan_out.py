@@ -0,0 +1,64 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("airflow.providers.http")
+
+from execute_any_operator.utils.http_fan_out import fan_out  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Echoes the request path and method, and remembers which client connection sent it."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode() if length else None
+        self.server.connections.add(self.client_address)
+        status = 500 if self.path.startswith("/fail") else 200
+        payload = json.dumps({"method": self.command, "path": self.path, "body": body}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("AIRFLOW_CONN_STUB", f"http://127.0.0.1:{server.server_address[1]}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fan_out_reuses_pooled_connections(stub_server):
+    specs = ((i, {"endpoint": f"items/{i}", "method": "GET"}) for i in range(50))
+    records = list(fan_out(specs, 4, {"http_conn_id": "stub"}, response_filter=lambda response: response.json()))
+
+    assert sorted(record["index"] for record in records) == list(range(50))
+    assert all(record["state"] == "success" and record["status_code"] == 200 for record in records)
+    assert {record["response"]["path"] for record in records} == {f"/items/{i}" for i in range(50)}
+    # Four worker threads, so at most four keep-alive connections were ever opened
+    assert len(stub_server.connections) <= 4
+
+
+def test_fan_out_records_failures(stub_server):
+    specs = [(0, {"endpoint": "fail"}), (1, {"endpoint": "items", "data": "payload"})]
+    records = sorted(fan_out(specs, 2, {"http_conn_id": "stub"}), key=lambda record: record["index"])
+
+    assert records[0]["state"] == "failed" and "500" in records[0]["error"]
+    assert records[1]["state"] == "success"
+    assert json.loads(records[1]["response"]) == {"method": "POST", "path": "/items", "body": "payload"}
@@ -0,0 +1,61 @@
+import pytest
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+from execute_any_operator.utils.s3_bulk import check_keys  # noqa: E402
+
+# moto 5 replaced the per-service mocks with mock_aws
+mock_aws = getattr(moto, "mock_aws", None) or moto.mock_s3
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="landing")
+        yield client
+
+
+def _put(client, *keys):
+    for key in keys:
+        client.put_object(Bucket="landing", Key=key, Body=b"data")
+
+
+def test_check_keys_lists_the_key_range(s3):
+    _put(s3, *(f"2022-06-01/{i:04d}.csv" for i in range(50)), "2022-06-02/0000.csv")
+    keys = ["s3://landing/2022-06-01/0010.csv", "s3://landing/2022-06-01/0020.csv", "2022-06-02/0000.csv"]
+    statuses, summary = check_keys(s3, keys + ["2022-06-01/missing.csv"], bucket_name="landing", timeout=0)
+    statuses = {status["key"]: status for status in statuses}
+
+    assert all(statuses[key]["found"] and statuses[key]["size"] == 4 for key in keys)
+    assert statuses["s3://landing/2022-06-01/0010.csv"]["bucket"] == "landing"
+    assert statuses["2022-06-01/missing.csv"] == {"key": "2022-06-01/missing.csv", "bucket": "landing", "found": False}
+    assert summary["found"] == 3 and summary["missing"] == 1
+    # One listing per directory, however many keys it holds
+    assert summary["list_requests"] == 2 and summary["head_requests"] == 0
+
+
+def test_check_keys_heads_keys_past_a_long_listing(s3):
+    # Two keys with more than two pages of objects between them
+    _put(s3, "d/a.csv", "d/z.csv", *(f"d/m{i:04d}" for i in range(2100)))
+    statuses, summary = check_keys(s3, ["d/a.csv", "d/z.csv"], bucket_name="landing", timeout=0)
+
+    assert all(status["found"] for status in statuses)
+    # The listing stops after as many pages as there are keys, and the rest are headed
+    assert summary["list_requests"] == 2
+    assert summary["head_requests"] == 1
+
+
+def test_check_keys_wildcards_resolve_against_a_prefix_listing(s3):
+    _put(s3, "logs/2022-06-01/part-0.json", "logs/2022-06-01/part-1.json", "logs/2022-06-01/_SUCCESS")
+    statuses, summary = check_keys(
+        s3, ["logs/2022-06-01/part-*.json", "logs/2022-06-02/*"], bucket_name="landing", wildcard_match=True, timeout=0
+    )
+
+    assert statuses[0]["matches"] == ["logs/2022-06-01/part-0.json", "logs/2022-06-01/part-1.json"]
+    assert not statuses[1]["found"]
+    assert summary["list_requests"] == 2
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from execute_any_operator.utils.sensors import (
+    load_sensor_state,
+    next_poke_interval,
+    poke_rescheduled,
+    poke_result,
+)
+
+
+def _sensor(**kwargs):
+    attributes = dict(
+        poke_interval=10, timeout=3600, exponential_backoff=False, dag_id="dag", task_id="task", soft_fail=False
+    )
+    attributes.update(kwargs)
+    return SimpleNamespace(**attributes)
+
+
+def test_next_poke_interval_without_backoff():
+    assert next_poke_interval(_sensor(), 0.0, 5, 100) == 10
+
+
+def test_next_poke_interval_backs_off_deterministically():
+    sensor = _sensor(exponential_backoff=True)
+    intervals = [next_poke_interval(sensor, 123.0, try_number, 0) for try_number in range(2, 7)]
+
+    assert intervals == [next_poke_interval(sensor, 123.0, try_number, 0) for try_number in range(2, 7)]
+    for try_number, interval in enumerate(intervals, start=2):
+        min_backoff = 10 * 2 ** (try_number - 2)
+        assert min_backoff <= interval < 2 * min_backoff
+
+
+@pytest.mark.parametrize("max_wait", [25, timedelta(seconds=25)])
+def test_next_poke_interval_is_capped(max_wait):
+    sensor = _sensor(exponential_backoff=True, max_wait=max_wait)
+    assert next_poke_interval(sensor, 0.0, 10, 0) == 25
+    # The remaining timeout caps it as well
+    assert next_poke_interval(_sensor(exponential_backoff=True), 0.0, 10, 3590) == 10
+
+
+def test_poke_result():
+    assert poke_result(True) == (True, None)
+    assert poke_result(None) == (False, None)
+    assert poke_result(SimpleNamespace(is_done=True, xcom_value={"key": 1})) == (True, {"key": 1})
+
+
+def _task(results, **kwargs):
+    sensor = _sensor(**kwargs)
+    sensor.poke = lambda context: results.pop(0)
+    return SimpleNamespace(task=sensor, task_id=sensor.task_id, context={}, render_templates=lambda: None)
+
+
+def test_poke_rescheduled_checkpoints_until_done(tmp_path, monkeypatch):
+    pytest.importorskip("airflow.exceptions")
+    state_file = str(tmp_path / "state.json")
+    now = [1000.0]
+    monkeypatch.setattr("execute_any_operator.utils.sensors.time.time", lambda: now[0])
+    task = _task([False, True])
+
+    assert poke_rescheduled(task, state_file)[:2] == (False, None)
+    assert load_sensor_state(state_file)["next_poke_at"] == 1010.0
+    # Not due yet, so the sensor is not poked
+    now[0] = 1005.0
+    assert poke_rescheduled(task, state_file)[2]["try_number"] == 1
+    now[0] = 1010.0
+    done, _, state = poke_rescheduled(task, state_file)
+    assert done and state["try_number"] == 2
+    assert load_sensor_state(state_file) is None
+
+
+def test_poke_rescheduled_times_out(tmp_path, monkeypatch):
+    exceptions = pytest.importorskip("airflow.exceptions")
+    state_file = str(tmp_path / "state.json")
+    now = [0.0]
+    monkeypatch.setattr("execute_any_operator.utils.sensors.time.time", lambda: now[0])
+    task = _task([False, False], timeout=5)
+
+    poke_rescheduled(task, state_file)
+    now[0] = 10.0
+    with pytest.raises(exceptions.AirflowSensorTimeout):
+        poke_rescheduled(task, state_file)
+    assert load_sensor_state(state_file) is None
@@ -0,0 +1,92 @@
+import io
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+from execute_any_operator.utils import streaming
+from execute_any_operator.utils.streaming import TailBuffer, output_sink, reserve_stdout, stream_output
+
+MEGABYTE = 1024 * 1024
+
+
+def _stream_command(lines: int, tail_lines: int = 3):
+    """Stream ``lines`` 100-byte lines printed by a subprocess into a discarding sink."""
+    script = f"import sys\nfor i in range({lines}):\n    sys.stdout.buffer.write(b'x' * 99 + b'\\n')\n"
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    tail = TailBuffer(tail_lines)
+    tracemalloc.start()
+    try:
+        with open(os.devnull, "wb") as sink:
+            copied = stream_output(process.stdout.fileno(), [sink], tail)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        process.stdout.close()
+        process.wait()
+    return copied, peak, tail.tail()
+
+
+def test_stream_output_memory_does_not_grow_with_output():
+    small_copied, small_peak, _ = _stream_command(20_000)
+    large_copied, large_peak, tail = _stream_command(1_000_000)
+
+    assert (small_copied, large_copied) == (2_000_000, 100_000_000)
+    assert tail == [b"x" * 99] * 3
+    # Only a read chunk and the tail are held, however much the command prints
+    assert large_peak < MEGABYTE
+    assert large_peak < small_peak + 256 * 1024
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        ([b"a\nb\nc\n"], [b"b", b"c"]),
+        ([b"a\nb", b"\nc"], [b"b", b"c"]),
+        ([b"a", b"b", b"c"], [b"abc"]),
+        ([b"a\n", b"\n"], [b"a", b""]),
+    ],
+)
+def test_tail_buffer(chunks, expected):
+    tail = TailBuffer(2)
+    for chunk in chunks:
+        tail.feed(chunk)
+    assert tail.tail() == expected
+
+
+def test_output_sink_is_stderr_when_stdout_carries_records(monkeypatch):
+    monkeypatch.setattr(streaming, "_records_on_stdout", False)
+    assert output_sink() is sys.stdout.buffer
+
+    reserve_stdout(io.StringIO())
+    assert output_sink() is sys.stdout.buffer
+
+    with open(sys.__stdout__.fileno(), "w", closefd=False) as stdout:
+        reserve_stdout(stdout)
+    assert output_sink() is sys.stderr.buffer
+
+
+def test_stream_output_forwards_whole_lines():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"one\ntw")
+    os.write(write_fd, b"o\nthree")
+    os.close(write_fd)
+
+    class Sink(io.BytesIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(bytes(data))
+            return super().write(data)
+
+    sink = Sink()
+    try:
+        copied = stream_output(read_fd, [sink], TailBuffer(1))
+    finally:
+        os.close(read_fd)
+    assert copied == len(b"one\ntwo\nthree")
+    assert b"".join(sink.writes) == b"one\ntwo\nthree"
+    assert all(write.endswith(b"\n") for write in sink.writes[:-1])